@@ -2,14 +2,15 @@
 Agent API Endpoints
 """
 
-import json
+import asyncio
 import uuid
 from collections import defaultdict
 from datetime import datetime
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional, Union
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
-from sse_starlette.sse import EventSourceResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
 from app.api.v1.schemas.agent import (
     AgentCommandRequest,
@@ -29,6 +30,15 @@ router = APIRouter(prefix="/agent", tags=["Agent"])
 _task_store: dict[str, AgentState] = {}
 
 
+def _dumps(data: Any) -> str:
+    """Serialize an SSE payload (datetimes are emitted natively as UTC)."""
+    return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC).decode()
+
+
+# Max thought events coalesced into a single SSE write
+_SSE_BATCH_MAX = 16
+
+
 @router.post("/execute")
 async def execute_command(request: AgentCommandRequest):
     """
@@ -49,37 +59,62 @@ async def execute_command(request: AgentCommandRequest):
     """
     orchestrator = create_orchestrator()
 
-    async def event_generator() -> AsyncGenerator[dict, None]:
+    async def event_generator() -> AsyncGenerator[Union[bytes, dict], None]:
         task_id = ""
         total_tokens = 0
 
-        try:
-            async for step in orchestrator.run(request.command):
-                # Get task_id from orchestrator's current state (first time)
-                if not task_id and orchestrator.current_state:
-                    task_id = orchestrator.current_state.task_id
-                    # Save to store immediately
-                    _task_store[task_id] = orchestrator.current_state
+        # Run the agent in a producer task so steps that pile up while a write
+        # is in flight can be flushed together in one frame batch.
+        queue: asyncio.Queue[Optional[ThoughtStep]] = asyncio.Queue()
 
-                total_tokens += step.tokens_used
+        async def produce() -> None:
+            try:
+                async for step in orchestrator.run(request.command):
+                    await queue.put(step)
+            finally:
+                await queue.put(None)
 
-                # Convert step to dict for SSE
-                step_data = step.to_log_dict()
+        producer = asyncio.create_task(produce())
 
-                yield {
-                    "event": "thought",
-                    "data": json.dumps(step_data, ensure_ascii=False),
-                }
+        try:
+            finished = False
+            while not finished:
+                batch = [await queue.get()]
+                while len(batch) < _SSE_BATCH_MAX and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                frames = bytearray()
+                for step in batch:
+                    if step is None:
+                        finished = True
+                        break
+
+                    # Get task_id from orchestrator's current state (first time)
+                    if not task_id and orchestrator.current_state:
+                        task_id = orchestrator.current_state.task_id
+                        # Save to store immediately
+                        _task_store[task_id] = orchestrator.current_state
+
+                    total_tokens += step.tokens_used
+                    frames += ServerSentEvent(
+                        data=_dumps(step.to_log_dict()), event="thought"
+                    ).encode()
+
+                if frames:
+                    yield bytes(frames)
+
+            # Surface any exception raised inside the agent run
+            await producer
 
         except Exception as e:
             # Emit error event
             yield {
                 "event": "error",
-                "data": json.dumps(
-                    {"error": str(e), "phase": "execution"},
-                    ensure_ascii=False,
-                ),
+                "data": _dumps({"error": str(e), "phase": "execution"}),
             }
+        finally:
+            if not producer.done():
+                producer.cancel()
 
         # Update store with final state (ensures collected_data is current)
         if orchestrator.current_state and task_id:
@@ -88,13 +123,12 @@ async def execute_command(request: AgentCommandRequest):
         # Emit completion event
         yield {
             "event": "complete",
-            "data": json.dumps(
+            "data": _dumps(
                 {
                     "task_id": task_id or "task_unknown",
                     "total_tokens": total_tokens,
                     "status": "completed",
-                },
-                ensure_ascii=False,
+                }
             ),
         }
 
@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     agent_maestro_url: str = Field(default="http://localhost:23333/api/anthropic")
     claude_model_light: str = Field(default="claude-opus-4.5")
     claude_model_heavy: str = Field(default="claude-opus-4.5")
+    # Negotiate HTTP/2 (via TLS ALPN) on the shared LLM HTTP client; disable if the
+    # proxy misbehaves with h2. Cleartext http:// endpoints always use HTTP/1.1.
+    llm_http2: bool = Field(default=True)
 
     # Database
     database_url: str = Field(
@@ -12,6 +12,7 @@ from app.core.agent.self_healer import (
     RecoveryStrategy,
     ErrorContext,
     RecoveryAction,
+    CircuitState,
     get_self_healer,
 )
 
@@ -38,5 +39,6 @@ __all__ = [
     "RecoveryStrategy",
     "ErrorContext",
     "RecoveryAction",
+    "CircuitState",
     "get_self_healer",
 ]
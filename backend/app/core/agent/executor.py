@@ -134,7 +134,7 @@ class Executor:
         # Process search results
         if subtask.task_type == "search" and "results" in data:
             # Add to collected data
-            state.collected_data.extend(data["results"])
+            state.add_collected_data(data["results"])
 
             # Process discovered keywords for expansion
             if "discovered_keywords" in data:
@@ -80,6 +80,7 @@ class AgentOrchestrator:
         self,
         command: str,
         on_step: Optional[Callable[[ThoughtStep], None]] = None,
+        thought_sink: Optional[Callable[[ThoughtStep], None]] = None,
     ) -> AsyncGenerator[ThoughtStep, None]:
         """
         Execute the Agentic Loop for a command.
@@ -87,6 +88,8 @@ class AgentOrchestrator:
         Args:
             command: User command to execute
             on_step: Optional callback for each step (for real-time updates)
+            thought_sink: Optional sink receiving every recorded thought step as
+                it is added (e.g. for persistence or streaming)
 
         Yields:
             ThoughtStep objects representing each step of execution
@@ -94,6 +97,7 @@ class AgentOrchestrator:
         # Initialize state and store reference
         self._current_state = AgentState(original_command=command)
         state = self._current_state
+        state.set_thought_sink(thought_sink)
         state.mark_started()
 
         # Set up screenshot callback on platform_search tool
@@ -366,7 +370,7 @@ class AgentOrchestrator:
                     if result.success and result.data:
                         # Add results to collected data
                         new_results = result.data.get("results", [])
-                        state.collected_data.extend(new_results)
+                        state.add_collected_data(new_results)
 
                         # Track this keyword as searched
                         state.discovered_keywords.append(keyword)
@@ -4,15 +4,27 @@ Self-Healing Module
 Provides error recovery and self-healing capabilities for the Agent.
 """
 
+import functools
+import heapq
+import json
 import logging
+import random
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _build_backoff_schedule(
+    initial_ms: int, multiplier: int, max_ms: int, steps: int = 16
+) -> Tuple[int, ...]:
+    """Precompute the capped exponential backoff for retry counts 0..steps-1."""
+    return tuple(min(initial_ms * multiplier**i, max_ms) for i in range(steps))
+
+
 class ErrorType(str, Enum):
     """Types of errors the Agent can encounter."""
 
@@ -27,6 +39,32 @@ class ErrorType(str, Enum):
     UNKNOWN = "unknown"  # Unknown errors
 
 
+@functools.lru_cache(maxsize=1)
+def _type_to_error() -> Tuple[Tuple[type, ErrorType], ...]:
+    """
+    Known exception types, checked in order before falling back to message matching.
+
+    Subclasses must precede their bases (JSONDecodeError is a ValueError, etc.).
+    Built on first use so importing the healer doesn't load the crawler package.
+    """
+    from app.crawlers.base import (
+        BlockedException,
+        CaptchaException,
+        ParseException,
+        RateLimitedException,
+    )
+
+    return (
+        (RateLimitedException, ErrorType.RATE_LIMIT),
+        (BlockedException, ErrorType.BLOCKED),
+        (CaptchaException, ErrorType.BLOCKED),
+        (ParseException, ErrorType.PARSE),
+        (json.JSONDecodeError, ErrorType.PARSE),
+        (TimeoutError, ErrorType.TIMEOUT),  # asyncio.TimeoutError is an alias on 3.11+
+        (ConnectionError, ErrorType.NETWORK),
+    )
+
+
 class RecoveryStrategy(str, Enum):
     """Recovery strategies for different error types."""
 
@@ -40,6 +78,26 @@ class RecoveryStrategy(str, Enum):
     ESCALATE = "escalate"  # Escalate to user
 
 
+class CircuitState(str, Enum):
+    """Circuit breaker states for a source."""
+
+    CLOSED = "closed"  # Normal traffic
+    OPEN = "open"  # Cooling down, all traffic diverted
+    HALF_OPEN = "half_open"  # Cooldown elapsed, limited probes allowed
+
+
+@dataclass(slots=True)
+class CBState:
+    """Circuit breaker state for a single source."""
+
+    state: CircuitState = CircuitState.CLOSED
+    # time.monotonic() deadline: end of cooldown while OPEN, idle purge while HALF_OPEN
+    open_until: float = 0.0
+    reset_timeout: float = 60.0  # Current cooldown, doubled on each reopen
+    half_open_permits: int = 0  # Probes still allowed while HALF_OPEN
+    consecutive_successes: int = 0
+
+
 @dataclass
 class ErrorContext:
     """Context information about an error."""
@@ -61,6 +119,8 @@ class RecoveryAction:
     parameters: Dict[str, Any] = field(default_factory=dict)
     description: str = ""
     expected_success_rate: float = 0.5
+    # Source whose half-open probe permit this action holds (resolved by attempt_recovery)
+    probe_source: Optional[str] = field(default=None, repr=False)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -157,11 +217,19 @@ class SelfHealer:
     INITIAL_BACKOFF_MS = 1000
     MAX_BACKOFF_MS = 30000
     BACKOFF_MULTIPLIER = 2
+    _BACKOFF_SCHEDULE = _build_backoff_schedule(
+        INITIAL_BACKOFF_MS, BACKOFF_MULTIPLIER, MAX_BACKOFF_MS
+    )
+
+    # Circuit breaker configuration
+    HALF_OPEN_SUCCESS_THRESHOLD = 2  # Consecutive probe successes before closing
+    MAX_RESET_TIMEOUT_S = 600.0
 
     def __init__(self):
         self._error_history: List[ErrorContext] = []
         self._recovery_callbacks: Dict[RecoveryStrategy, Callable] = {}
-        self._circuit_breaker: Dict[str, datetime] = {}  # source -> cooldown_until
+        self._circuit_breaker: Dict[str, CBState] = {}  # source -> breaker (absent = closed)
+        self._cb_heap: List[Tuple[float, str]] = []  # (open_until, source) expiry queue
 
     def classify_error(self, error: Exception, source: Optional[str] = None) -> ErrorContext:
         """
@@ -174,25 +242,9 @@ class SelfHealer:
         Returns:
             ErrorContext with classification
         """
-        error_str = str(error).lower()
-
-        # Classify based on error message patterns
-        if any(kw in error_str for kw in ["connection", "network", "unreachable", "dns"]):
-            error_type = ErrorType.NETWORK
-        elif any(kw in error_str for kw in ["rate limit", "429", "too many requests", "频率"]):
-            error_type = ErrorType.RATE_LIMIT
-        elif any(kw in error_str for kw in ["403", "blocked", "forbidden", "access denied", "封禁"]):
-            error_type = ErrorType.BLOCKED
-        elif any(kw in error_str for kw in ["parse", "json", "decode", "format"]):
-            error_type = ErrorType.PARSE
-        elif any(kw in error_str for kw in ["timeout", "timed out"]):
-            error_type = ErrorType.TIMEOUT
-        elif any(kw in error_str for kw in ["401", "auth", "unauthorized", "token"]):
-            error_type = ErrorType.AUTH
-        elif any(kw in error_str for kw in ["llm", "model", "api key", "quota"]):
-            error_type = ErrorType.LLM
-        else:
-            error_type = ErrorType.UNKNOWN
+        error_type = self._classify_by_type(error)
+        if error_type is None:
+            error_type = self._classify_by_message(str(error).lower())
 
         # Determine if recoverable
         recoverable = error_type not in [ErrorType.AUTH]
@@ -208,6 +260,33 @@ class SelfHealer:
         self._error_history.append(context)
         return context
 
+    @staticmethod
+    def _classify_by_type(error: Exception) -> Optional[ErrorType]:
+        """Classify known exception types without scanning the message."""
+        for exc_type, error_type in _type_to_error():
+            if isinstance(error, exc_type):
+                return error_type
+        return None
+
+    @staticmethod
+    def _classify_by_message(error_str: str) -> ErrorType:
+        """Classify an error from its lowercased message."""
+        if any(kw in error_str for kw in ["connection", "network", "unreachable", "dns"]):
+            return ErrorType.NETWORK
+        elif any(kw in error_str for kw in ["rate limit", "429", "too many requests", "频率"]):
+            return ErrorType.RATE_LIMIT
+        elif any(kw in error_str for kw in ["403", "blocked", "forbidden", "access denied", "封禁"]):
+            return ErrorType.BLOCKED
+        elif any(kw in error_str for kw in ["parse", "json", "decode", "format"]):
+            return ErrorType.PARSE
+        elif any(kw in error_str for kw in ["timeout", "timed out"]):
+            return ErrorType.TIMEOUT
+        elif any(kw in error_str for kw in ["401", "auth", "unauthorized", "token"]):
+            return ErrorType.AUTH
+        elif any(kw in error_str for kw in ["llm", "model", "api key", "quota"]):
+            return ErrorType.LLM
+        return ErrorType.UNKNOWN
+
     def get_recovery_action(
         self,
         context: ErrorContext,
@@ -232,14 +311,29 @@ class SelfHealer:
             )
 
         # Check circuit breaker
-        if context.source and context.source in self._circuit_breaker:
-            if datetime.utcnow() < self._circuit_breaker[context.source]:
+        probe_source = None
+        if context.source and self._circuit_breaker:
+            allowed, is_probe = self._allow_request(context.source)
+            if not allowed:
                 return RecoveryAction(
                     strategy=RecoveryStrategy.SWITCH_PLATFORM,
                     parameters={"reason": "circuit_breaker"},
                     description=f"{context.source} 处于冷却期",
                     expected_success_rate=0.6,
                 )
+            if is_probe:
+                probe_source = context.source
+
+        action = self._select_action(context, available_platforms)
+        action.probe_source = probe_source
+        return action
+
+    def _select_action(
+        self,
+        context: ErrorContext,
+        available_platforms: Optional[List[str]],
+    ) -> RecoveryAction:
+        """Pick the first applicable recovery strategy for the error type."""
 
         # Get strategies for this error type
         strategies = self.RECOVERY_STRATEGIES.get(
@@ -333,10 +427,21 @@ class SelfHealer:
 
         context.retry_count += 1
 
+        # A half-open probe held by this action is resolved on every outcome:
+        # a retry reports its result, anything else hands the permit back
+        probes = retry_func is not None and action.strategy in (
+            RecoveryStrategy.RETRY,
+            RecoveryStrategy.RETRY_WITH_BACKOFF,
+        )
+        if action.probe_source and not probes:
+            self._release_probe(action.probe_source)
+
         try:
             if action.strategy == RecoveryStrategy.RETRY:
                 if retry_func:
                     result = await retry_func()
+                    if context.source:
+                        self.record_success(context.source)
                     return RecoveryResult(
                         success=True,
                         action_taken=action,
@@ -350,6 +455,8 @@ class SelfHealer:
 
                 if retry_func:
                     result = await retry_func()
+                    if context.source:
+                        self.record_success(context.source)
                     return RecoveryResult(
                         success=True,
                         action_taken=action,
@@ -402,8 +509,15 @@ class SelfHealer:
                     message="需要人工介入处理",
                 )
 
+        except asyncio.CancelledError:
+            if action.probe_source and probes:
+                self._release_probe(action.probe_source)
+            raise
+
         except Exception as e:
             logger.error(f"Recovery attempt failed: {e}")
+            if context.source:
+                self.record_failure(context.source)
             return RecoveryResult(
                 success=False,
                 action_taken=action,
@@ -416,10 +530,18 @@ class SelfHealer:
             message="恢复操作未完成",
         )
 
-    def _calculate_backoff(self, retry_count: int) -> int:
-        """Calculate exponential backoff duration."""
-        backoff = self.INITIAL_BACKOFF_MS * (self.BACKOFF_MULTIPLIER ** retry_count)
-        return min(backoff, self.MAX_BACKOFF_MS)
+    def _calculate_backoff(self, retry_count: int, jitter: bool = False) -> int:
+        """
+        Look up exponential backoff duration from the precomputed schedule.
+
+        With ``jitter`` the delay is drawn uniformly from [0, backoff] to
+        decorrelate concurrent retries.
+        """
+        schedule = self._BACKOFF_SCHEDULE
+        backoff = schedule[min(retry_count, len(schedule) - 1)]
+        if jitter:
+            return int(backoff * random.random())
+        return backoff
 
     def trip_circuit_breaker(self, source: str, cooldown_seconds: int = 60) -> None:
         """
@@ -427,15 +549,97 @@ class SelfHealer:
 
         Args:
             source: Source to block
-            cooldown_seconds: How long to block
+            cooldown_seconds: How long to block before allowing a probe
         """
-        self._circuit_breaker[source] = datetime.utcnow() + timedelta(seconds=cooldown_seconds)
+        cb = self._circuit_breaker.setdefault(source, CBState())
+        cb.reset_timeout = float(cooldown_seconds)
+        self._open_breaker(source, cb)
         logger.warning(f"Circuit breaker tripped for {source}, cooldown: {cooldown_seconds}s")
 
     def reset_circuit_breaker(self, source: str) -> None:
         """Reset circuit breaker for a source."""
         self._circuit_breaker.pop(source, None)
 
+    def record_success(self, source: str) -> None:
+        """Record a successful call; closes a half-open breaker after enough probes."""
+        cb = self._circuit_breaker.get(source)
+        if cb is None or cb.state is not CircuitState.HALF_OPEN:
+            return
+        cb.consecutive_successes += 1
+        if cb.consecutive_successes >= self.HALF_OPEN_SUCCESS_THRESHOLD:
+            del self._circuit_breaker[source]
+            logger.info(f"Circuit breaker closed for {source}")
+        else:
+            cb.half_open_permits = 1
+            self._schedule_half_open_purge(source, cb, time.monotonic())
+
+    def record_failure(self, source: str) -> None:
+        """Record a failed call; a failed half-open probe reopens with doubled cooldown."""
+        cb = self._circuit_breaker.get(source)
+        if cb is None or cb.state is not CircuitState.HALF_OPEN:
+            return
+        cb.reset_timeout = min(cb.reset_timeout * 2, self.MAX_RESET_TIMEOUT_S)
+        self._open_breaker(source, cb)
+        logger.warning(f"Circuit breaker reopened for {source}, cooldown: {cb.reset_timeout:.0f}s")
+
+    def _open_breaker(self, source: str, cb: CBState) -> None:
+        """Move a breaker to OPEN for its current reset timeout."""
+        cb.state = CircuitState.OPEN
+        cb.open_until = time.monotonic() + cb.reset_timeout
+        cb.half_open_permits = 0
+        cb.consecutive_successes = 0
+        heapq.heappush(self._cb_heap, (cb.open_until, source))
+
+    def _allow_request(self, source: str) -> Tuple[bool, bool]:
+        """
+        Check whether a request to source may proceed.
+
+        Returns (allowed, is_probe). A half-open breaker hands out its probe
+        permit; the caller must resolve it with record_success,
+        record_failure or _release_probe.
+        """
+        self._promote_expired_breakers(time.monotonic())
+        cb = self._circuit_breaker.get(source)
+        if cb is None or cb.state is CircuitState.CLOSED:
+            return True, False
+        if cb.state is CircuitState.HALF_OPEN and cb.half_open_permits > 0:
+            cb.half_open_permits -= 1
+            return True, True
+        return False, False
+
+    def _release_probe(self, source: str) -> None:
+        """Hand back a half-open probe permit that wasn't used for a probe."""
+        cb = self._circuit_breaker.get(source)
+        if cb is not None and cb.state is CircuitState.HALF_OPEN:
+            cb.half_open_permits = 1
+
+    def _schedule_half_open_purge(self, source: str, cb: CBState, now: float) -> None:
+        """Drop a half-open breaker if it sees no probe result for another cooldown."""
+        cb.open_until = now + cb.reset_timeout
+        heapq.heappush(self._cb_heap, (cb.open_until, source))
+
+    def _promote_expired_breakers(self, now: float) -> None:
+        """
+        Advance breakers whose deadline has passed.
+
+        OPEN breakers move to HALF_OPEN; HALF_OPEN breakers that went a full
+        cooldown without a probe result, and any CLOSED entries, are purged
+        (an absent entry is a closed breaker).
+        """
+        heap = self._cb_heap
+        while heap and heap[0][0] <= now:
+            deadline, source = heapq.heappop(heap)
+            cb = self._circuit_breaker.get(source)
+            # Skip stale heap entries superseded by a later trip, probe or reset
+            if cb is None or cb.open_until != deadline:
+                continue
+            if cb.state is CircuitState.OPEN:
+                cb.state = CircuitState.HALF_OPEN
+                cb.half_open_permits = 1
+                self._schedule_half_open_purge(source, cb, now)
+            else:
+                del self._circuit_breaker[source]
+
     def get_error_stats(self) -> Dict[str, Any]:
         """Get error statistics."""
         if not self._error_history:
@@ -460,13 +664,10 @@ class SelfHealer:
         self._error_history.clear()
 
 
-# Global instance
-_self_healer: Optional[SelfHealer] = None
+# Global instance (built at import so concurrent callers share one healer)
+_self_healer: SelfHealer = SelfHealer()
 
 
 def get_self_healer() -> SelfHealer:
     """Get the global SelfHealer instance."""
-    global _self_healer
-    if _self_healer is None:
-        _self_healer = SelfHealer()
     return _self_healer
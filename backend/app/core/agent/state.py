@@ -7,9 +7,9 @@ Defines the state machine and data structures for Agent execution.
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 class AgentPhase(str, Enum):
@@ -47,11 +47,11 @@ class ThoughtStep(BaseModel):
     screenshot: Optional[str] = None  # Base64 encoded browser screenshot
 
     def to_log_dict(self) -> Dict[str, Any]:
-        """Convert to dict for SSE streaming."""
+        """Convert to dict for SSE streaming (timestamp is left to the serializer)."""
         result = {
             "step_id": self.step_id,
             "phase": self.phase.value,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.timestamp,
             "thought": self.thought,
             "action": self.action,
             "observation": self.observation,
@@ -102,6 +102,9 @@ class AgentState(BaseModel):
     - Error handling
     """
 
+    # State is mutated on every step; keep attribute assignment unvalidated
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     # Task identification
     task_id: str = Field(default_factory=lambda: f"task_{uuid.uuid4().hex[:12]}")
     original_command: str
@@ -111,7 +114,8 @@ class AgentState(BaseModel):
     subtasks: List[SubTask] = Field(default_factory=list)
     current_subtask_index: int = 0
 
-    # Thought chain (for frontend display)
+    # Thought chain (for frontend display) - the full execution history served
+    # by the task endpoints; steps are also mirrored to the optional thought sink
     thought_chain: List[ThoughtStep] = Field(default_factory=list)
 
     # Discovery and expansion
@@ -120,6 +124,7 @@ class AgentState(BaseModel):
 
     # Collected data
     collected_data: List[Dict[str, Any]] = Field(default_factory=list)
+    data_collected_count: int = 0  # Running total, maintained by add_collected_data
     credibility_scores: Dict[str, float] = Field(default_factory=dict)
 
     # Statistics
@@ -137,6 +142,12 @@ class AgentState(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    _thought_sink: Optional[Callable[[ThoughtStep], None]] = PrivateAttr(default=None)
+
+    def set_thought_sink(self, sink: Optional[Callable[[ThoughtStep], None]]) -> None:
+        """Set a sink (JSONL writer, SSE publisher, ...) that receives every thought step."""
+        self._thought_sink = sink
+
     def add_thought(
         self,
         phase: AgentPhase,
@@ -147,7 +158,8 @@ class AgentState(BaseModel):
         screenshot: Optional[str] = None,
     ) -> ThoughtStep:
         """Add a thought step to the chain."""
-        step = ThoughtStep(
+        # Inputs come from internal callers, so skip validation on this hot path
+        step = ThoughtStep.model_construct(
             phase=phase,
             thought=thought,
             action=action,
@@ -155,11 +167,18 @@ class AgentState(BaseModel):
             tokens_used=tokens_used,
             screenshot=screenshot,
         )
+        if self._thought_sink is not None:
+            self._thought_sink(step)
         self.thought_chain.append(step)
         self.total_tokens += tokens_used
         self.current_step += 1
         return step
 
+    def add_collected_data(self, items: List[Dict[str, Any]]) -> None:
+        """Append collected items and keep the running count in sync."""
+        self.collected_data.extend(items)
+        self.data_collected_count += len(items)
+
     def add_subtask(
         self,
         description: str,
@@ -237,7 +256,7 @@ class AgentState(BaseModel):
             "status": self.current_phase.value,
             "total_steps": self.current_step,
             "total_tokens": self.total_tokens,
-            "data_collected": len(self.collected_data),
+            "data_collected": self.data_collected_count,
             "keywords_discovered": len(self.discovered_keywords),
             "duration_ms": (
                 int((self.completed_at - self.started_at).total_seconds() * 1000)
@@ -1 +1,21 @@
-"""LLM module."""
+"""LLM module.
+
+Provider clients are imported lazily by the router, so importing this
+package does not pull in the Gemini SDK for Anthropic-only deployments.
+"""
+
+from app.core.llm.router import (
+    LLMClient,
+    LLMRouter,
+    ModelTier,
+    check_llm_availability,
+    get_llm_router,
+)
+
+__all__ = [
+    "LLMClient",
+    "LLMRouter",
+    "ModelTier",
+    "check_llm_availability",
+    "get_llm_router",
+]
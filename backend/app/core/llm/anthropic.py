@@ -5,12 +5,223 @@ This client connects to Agent Maestro VS Code extension which provides
 free access to Claude models through GitHub Copilot subscription.
 """
 
-import json
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import functools
+import time
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple, Union
 
 import httpx
+import orjson
 
 from app.config import settings
+from app.core.llm.http import get_shared_client
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Pre-serialized JSON spliced verbatim into a document by orjson.dumps
+# (orjson < 3.9.2 lacks Fragment; fall back to the parsed value)
+_json_fragment = getattr(orjson, "Fragment", orjson.loads)
+
+# Prompt-caching marker: lets the provider reuse its KV cache for static prefixes
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+def _system_blocks(
+    system_instruction: Optional[str], cached_segments: Tuple[str, ...] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Wrap a system instruction and static prompt segments as cacheable content blocks.
+
+    Each block is a cache breakpoint, so a shared system instruction stays
+    cached even when the segments after it vary between calls.
+    """
+    texts = ([system_instruction] if system_instruction else []) + list(cached_segments)
+    return [{"type": "text", "text": text, "cache_control": _EPHEMERAL_CACHE} for text in texts]
+
+
+# Hashable, order-preserving key for a tools list: (name, description, schema JSON)
+ToolsKey = Tuple[Tuple[str, str, bytes], ...]
+
+
+def _tools_key(tools: List[Dict[str, Any]]) -> ToolsKey:
+    """Build a stable cache key for a list of tool definitions."""
+    return tuple(
+        (
+            tool["name"],
+            tool.get("description", ""),
+            orjson.dumps(tool.get("parameters", {"type": "object", "properties": {}})),
+        )
+        for tool in tools
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _anthropic_tools_cached(tools_key: ToolsKey) -> Tuple[Dict[str, Any], ...]:
+    """Convert a tools key to Anthropic format, marking the list as a cache breakpoint."""
+    anthropic_tools = [
+        {"name": name, "description": description, "input_schema": orjson.loads(schema)}
+        for name, description, schema in tools_key
+    ]
+    if anthropic_tools:
+        anthropic_tools[-1]["cache_control"] = _EPHEMERAL_CACHE
+    return tuple(anthropic_tools)
+
+
+def _to_anthropic_tools(tools: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """
+    Convert tool definitions to Anthropic format.
+
+    Conversions are memoized, so agent loops reusing the same toolset skip
+    rebuilding the schema dicts. The result is shared; do not mutate it.
+    """
+    return _anthropic_tools_cached(_tools_key(tools))
+
+
+@functools.lru_cache(maxsize=64)
+def _anthropic_tools_json_cached(tools_key: ToolsKey) -> Any:
+    """Serialize the converted tools once per toolset."""
+    return _json_fragment(orjson.dumps(_anthropic_tools_cached(tools_key)))
+
+
+def _anthropic_tools_payload(tools: List[Dict[str, Any]]) -> Any:
+    """
+    Tools for a request payload, pre-serialized (as an orjson Fragment).
+
+    Request bodies splice the cached bytes instead of re-encoding the
+    schema tree on every call.
+    """
+    return _anthropic_tools_json_cached(_tools_key(tools))
+
+
+def _extract_usage(data: Dict[str, Any]) -> Dict[str, int]:
+    """Extract token usage, including prompt-cache reads and writes."""
+    usage = data.get("usage", {})
+    return {
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+        "cache_read_input_tokens": usage.get("cache_read_input_tokens", 0),
+        "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0),
+    }
+
+
+# Byte markers for the text_delta fast path in streaming responses
+_TEXT_DELTA_MARKER = b'"type":"text_delta"'
+_TEXT_FIELD = b'"text":"'
+_CONTENT_BLOCK_MARKER = b'"content_block_'
+
+
+class SSEParser:
+    """
+    Incremental Server-Sent Events parser over raw bytes.
+
+    Keeps a scan offset so bytes already searched for an event boundary are
+    not rescanned when the next chunk arrives.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Append a chunk of the response body."""
+        if b"\r" in chunk:
+            # Normalize CRLF line endings (a CR/LF pair may be split across chunks)
+            chunk = chunk.replace(b"\r", b"")
+        self._buf += chunk
+
+    def events(self) -> Iterator[bytes]:
+        """Yield the data payload of each complete event in the buffer."""
+        buf = self._buf
+        start = 0
+        while True:
+            end = buf.find(b"\n\n", max(self._pos, start))
+            if end == -1:
+                break
+            data = self._event_data(bytes(buf[start:end]))
+            start = end + 2
+            if data:
+                yield data
+        if start:
+            del buf[:start]
+        # A boundary may straddle chunks, so rescan only the last byte
+        self._pos = max(len(buf) - 1, 0)
+
+    @staticmethod
+    def _event_data(block: bytes) -> bytes:
+        """Join the data: lines of one event."""
+        # Fast path: a single data line (e.g. "event: ...\ndata: {...}")
+        if block.startswith(b"data:"):
+            start = 0
+        else:
+            start = block.find(b"\ndata:")
+            if start == -1:
+                return b""
+            start += 1
+        if block.find(b"\ndata:", start) == -1:
+            end = block.find(b"\n", start)
+            line = block[start + 5 : end if end != -1 else len(block)]
+            return line[1:] if line.startswith(b" ") else line
+
+        lines = []
+        for line in block.split(b"\n"):
+            if line.startswith(b"data:"):
+                line = line[5:]
+                lines.append(line[1:] if line.startswith(b" ") else line)
+        return b"\n".join(lines)
+
+
+def _slice_text_delta(payload: bytes) -> Optional[str]:
+    """
+    Slice the text out of a text_delta event without parsing it.
+
+    Returns None if the payload isn't a text_delta or the text contains
+    escapes; callers then parse the event.
+    """
+    if _TEXT_DELTA_MARKER not in payload:
+        return None
+    start = payload.find(_TEXT_FIELD)
+    if start == -1:
+        return None
+    start += len(_TEXT_FIELD)
+    end = payload.find(b'"', start)
+    if end == -1 or payload.find(b"\\", start, end) != -1:
+        return None
+    return payload[start:end].decode("utf-8")
+
+
+def _parse_stream_event(payload: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse a content-block event; other events (pings, message_start/stop)
+    are skipped without parsing.
+    """
+    if _CONTENT_BLOCK_MARKER not in payload:
+        return None
+    try:
+        return orjson.loads(payload)
+    except ValueError:  # JSONDecodeError and UnicodeDecodeError
+        return None
+
+
+def _event_text_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Text of a parsed text_delta event, or None for any other event."""
+    if event.get("type") == "content_block_delta":
+        delta = event.get("delta", {})
+        if delta.get("type") == "text_delta":
+            return delta.get("text", "")
+    return None
+
+
+def _extract_text_delta(payload: bytes) -> Optional[str]:
+    """
+    Extract the text of a text_delta event.
+
+    Slices the text directly when it contains no escapes; otherwise parses
+    the event, unless the byte markers show it isn't a content-block event.
+    """
+    text = _slice_text_delta(payload)
+    if text is not None:
+        return text
+    event = _parse_stream_event(payload)
+    return _event_text_delta(event) if event is not None else None
 
 
 class AnthropicClient:
@@ -34,24 +245,23 @@ class AnthropicClient:
             base_url: Agent Maestro proxy URL
         """
         self.model_name = model_name
-        self.base_url = base_url
-        self._client: Optional[httpx.AsyncClient] = None
+        self.base_url = base_url.rstrip("/")
+        self.messages_url = f"{self.base_url}/v1/messages"
 
     @property
     def client(self) -> httpx.AsyncClient:
-        """Get or create the HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=httpx.Timeout(120.0, connect=10.0),
-            )
-        return self._client
+        """Get the shared pooled HTTP client."""
+        return get_shared_client()
 
-    async def close(self):
-        """Close the HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a Messages API request and parse the JSON response from raw bytes."""
+        async with self.client.stream(
+            "POST", self.messages_url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        ) as response:
+            response.raise_for_status()
+            raw = await response.aread()
+        # Connection is back in the pool before the (possibly large) body is parsed
+        return orjson.loads(raw)
 
     async def generate(
         self,
@@ -59,6 +269,7 @@ class AnthropicClient:
         system_instruction: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        cached_segments: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate content from prompt.
@@ -68,38 +279,32 @@ class AnthropicClient:
             system_instruction: System instruction for the model
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            cached_segments: Static instructions sent as cached system blocks
+                after the system instruction
 
         Returns:
             Dict with text and token usage
         """
-        messages = [{"role": "user", "content": prompt}]
-
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-        }
-
-        if system_instruction:
-            payload["system"] = system_instruction
+        # Static (cacheable) content first, dynamic user message last
+        payload: Dict[str, Any] = {"model": self.model_name}
+        if system_instruction or cached_segments:
+            payload["system"] = _system_blocks(system_instruction, tuple(cached_segments or ()))
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["max_tokens"] = max_tokens
+        payload["temperature"] = temperature
 
-        response = await self.client.post("/v1/messages", json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._post(payload)
 
         # Extract text from response
-        text = ""
-        for block in data.get("content", []):
-            if block.get("type") == "text":
-                text += block.get("text", "")
+        text = "".join(
+            block.get("text", "")
+            for block in data.get("content", ())
+            if block.get("type") == "text"
+        )
 
         return {
             "text": text,
-            "usage": {
-                "prompt_tokens": data.get("usage", {}).get("input_tokens", 0),
-                "completion_tokens": data.get("usage", {}).get("output_tokens", 0),
-            },
+            "usage": _extract_usage(data),
         }
 
     async def generate_stream(
@@ -108,6 +313,7 @@ class AnthropicClient:
         system_instruction: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        cached_segments: Optional[List[str]] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Generate content with streaming.
@@ -117,40 +323,34 @@ class AnthropicClient:
             system_instruction: System instruction for the model
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            cached_segments: Static instructions sent as cached system blocks
+                after the system instruction
 
         Yields:
             Text chunks as they are generated
-        """
-        messages = [{"role": "user", "content": prompt}]
-
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "stream": True,
-        }
 
-        if system_instruction:
-            payload["system"] = system_instruction
+        The stream shares the pooled client, so on an HTTP/2 connection it runs
+        as one multiplexed stream alongside other in-flight requests.
+        """
+        payload: Dict[str, Any] = {"model": self.model_name}
+        if system_instruction or cached_segments:
+            payload["system"] = _system_blocks(system_instruction, tuple(cached_segments or ()))
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["max_tokens"] = max_tokens
+        payload["temperature"] = temperature
+        payload["stream"] = True
 
         async with self.client.stream(
-            "POST", "/v1/messages", json=payload
+            "POST", self.messages_url, content=orjson.dumps(payload), headers=_JSON_HEADERS
         ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data:"):
-                    data_str = line[5:].strip()
-                    if not data_str:
-                        continue
-                    try:
-                        data = json.loads(data_str)
-                        if data.get("type") == "content_block_delta":
-                            delta = data.get("delta", {})
-                            if delta.get("type") == "text_delta":
-                                yield delta.get("text", "")
-                    except json.JSONDecodeError:
-                        continue
+            parser = SSEParser()
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for payload in parser.events():
+                    text = _extract_text_delta(payload)
+                    if text is not None:
+                        yield text
 
     async def generate_with_tools(
         self,
@@ -173,55 +373,58 @@ class AnthropicClient:
         Returns:
             Dict with response and potential function calls
         """
-        messages = [{"role": "user", "content": prompt}]
-
-        # Convert tools to Anthropic format
-        anthropic_tools = []
-        for tool in tools:
-            anthropic_tools.append({
-                "name": tool["name"],
-                "description": tool.get("description", ""),
-                "input_schema": tool.get("parameters", {"type": "object", "properties": {}}),
-            })
-
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "tools": anthropic_tools,
-        }
-
+        # Static (cacheable) content first: system, then tools, then the user message
+        payload: Dict[str, Any] = {"model": self.model_name}
         if system_instruction:
-            payload["system"] = system_instruction
+            payload["system"] = _system_blocks(system_instruction)
+        payload["tools"] = _anthropic_tools_payload(tools)
+        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload["max_tokens"] = max_tokens
+        payload["temperature"] = temperature
 
-        response = await self.client.post("/v1/messages", json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._post(payload)
 
         # Extract text and function calls
-        text = ""
+        parts = []
         function_calls = []
 
-        for block in data.get("content", []):
-            if block.get("type") == "text":
-                text += block.get("text", "")
-            elif block.get("type") == "tool_use":
+        for block in data.get("content", ()):
+            block_type = block.get("type")
+            if block_type == "text":
+                parts.append(block.get("text", ""))
+            elif block_type == "tool_use":
                 function_calls.append({
                     "id": block.get("id"),
                     "name": block.get("name"),
                     "args": block.get("input", {}),
                 })
+        text = "".join(parts)
 
         return {
             "text": text if text else None,
             "function_calls": function_calls,
-            "usage": {
-                "prompt_tokens": data.get("usage", {}).get("input_tokens", 0),
-                "completion_tokens": data.get("usage", {}).get("output_tokens", 0),
-            },
+            "usage": _extract_usage(data),
         }
 
+    def _chat_payload(
+        self,
+        messages: List[Dict[str, Any]],
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        tools: Optional[List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Build a Messages API payload for a multi-turn chat."""
+        payload: Dict[str, Any] = {"model": self.model_name}
+        if system_instruction:
+            payload["system"] = _system_blocks(system_instruction)
+        if tools:
+            payload["tools"] = _anthropic_tools_payload(tools)
+        payload["messages"] = messages
+        payload["max_tokens"] = max_tokens
+        payload["temperature"] = temperature
+        return payload
+
     async def chat(
         self,
         messages: List[Dict[str, Any]],
@@ -230,7 +433,7 @@ class AnthropicClient:
         max_tokens: int = 4096,
         tools: Optional[List[Dict[str, Any]]] = None,
         stream: bool = False,
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], AsyncGenerator[Dict[str, Any], None]]:
         """
         Multi-turn chat with Claude.
 
@@ -243,54 +446,144 @@ class AnthropicClient:
             stream: Whether to stream the response
 
         Returns:
-            Dict with response content and usage
+            Dict with response content and usage, or an async generator of
+            stream events (see chat_stream) when stream is True
         """
-        payload: Dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "stream": stream,
-        }
+        if stream:
+            return self.chat_stream(
+                messages, system_instruction, temperature, max_tokens, tools
+            )
+        return await self.chat_once(
+            messages, system_instruction, temperature, max_tokens, tools
+        )
 
-        if system_instruction:
-            payload["system"] = system_instruction
+    async def chat_once(
+        self,
+        messages: List[Dict[str, Any]],
+        system_instruction: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Multi-turn chat returning the complete response.
 
-        if tools:
-            anthropic_tools = []
-            for tool in tools:
-                anthropic_tools.append({
-                    "name": tool["name"],
-                    "description": tool.get("description", ""),
-                    "input_schema": tool.get("parameters", {"type": "object", "properties": {}}),
-                })
-            payload["tools"] = anthropic_tools
+        Returns:
+            Raw Messages API response
+        """
+        payload = self._chat_payload(
+            messages, system_instruction, temperature, max_tokens, tools
+        )
+        return await self._post(payload)
+
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        system_instruction: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Multi-turn chat yielding events as they arrive.
+
+        Yields:
+            {"type": "text", "delta": str} for text chunks,
+            {"type": "tool_use_start", "index": int, "id": str, "name": str}
+            when a tool call begins, and
+            {"type": "tool_use_delta", "index": int, "delta": str} for
+            partial tool input JSON
+        """
+        payload = self._chat_payload(
+            messages, system_instruction, temperature, max_tokens, tools
+        )
+        payload["stream"] = True
+
+        async with self.client.stream(
+            "POST", self.messages_url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        ) as response:
+            response.raise_for_status()
+            parser = SSEParser()
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for data in parser.events():
+                    text = _slice_text_delta(data)
+                    if text is not None:
+                        yield {"type": "text", "delta": text}
+                        continue
 
-        response = await self.client.post("/v1/messages", json=payload)
-        response.raise_for_status()
-        data = response.json()
+                    # Parsed at most once; pings etc. are skipped unparsed
+                    event = _parse_stream_event(data)
+                    if event is None:
+                        continue
+                    text = _event_text_delta(event)
+                    if text is not None:
+                        yield {"type": "text", "delta": text}
+                        continue
 
-        return data
+                    event_type = event.get("type")
+                    if event_type == "content_block_start":
+                        block = event.get("content_block", {})
+                        if block.get("type") == "tool_use":
+                            yield {
+                                "type": "tool_use_start",
+                                "index": event.get("index"),
+                                "id": block.get("id"),
+                                "name": block.get("name"),
+                            }
+                    elif event_type == "content_block_delta":
+                        delta = event.get("delta", {})
+                        if delta.get("type") == "input_json_delta":
+                            yield {
+                                "type": "tool_use_delta",
+                                "index": event.get("index"),
+                                "delta": delta.get("partial_json", ""),
+                            }
+
+
+# Last health check result: (base_url, checked_at monotonic, available)
+_last_health_check: Optional[Tuple[str, float, bool]] = None
 
 
 async def check_agent_maestro_health(
-    base_url: str = "http://localhost:23333"
+    base_url: str = "http://localhost:23333",
+    ttl: float = 5.0,
 ) -> bool:
     """
     Check if Agent Maestro proxy is available.
 
+    Issues a HEAD request over the shared pooled client and caches the
+    result for ``ttl`` seconds, so frequent probes don't open new sockets.
+
     Args:
         base_url: Agent Maestro base URL
+        ttl: Seconds to reuse the previous result
 
     Returns:
         True if available, False otherwise
     """
+    global _last_health_check
+    now = time.monotonic()
+    if (
+        _last_health_check
+        and _last_health_check[0] == base_url
+        and now - _last_health_check[1] < ttl
+    ):
+        return _last_health_check[2]
+
+    url = f"{base_url}/api/v1/info"
+    client = get_shared_client()
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.get(f"{base_url}/api/v1/info")
-            return response.status_code == 200
+        response = await client.head(url, timeout=3.0)
+        if response.status_code == 405:
+            # Endpoint doesn't accept HEAD; fall back to GET
+            response = await client.get(url, timeout=3.0)
+        available = response.status_code == 200
     except Exception:
-        return False
+        available = False
+
+    _last_health_check = (base_url, now, available)
+    return available
 
 
 # Singleton instances
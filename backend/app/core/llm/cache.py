@@ -0,0 +1,518 @@
+"""
+LLM Response Cache
+
+Caches deterministic LLM responses so repeated identical requests skip the
+remote model call entirely.
+
+Backends:
+- InMemoryLRU: process-local LRU with per-entry TTL (default)
+- RedisBackend: shared cache across workers via redis.asyncio
+
+SemanticCache additionally serves paraphrased prompts by embedding
+similarity, and ToolCallClusterCache answers tool-calling prompts whose
+cluster has converged on a single function call.
+"""
+
+import hashlib
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
+from uuid import uuid4
+
+import orjson
+
+if TYPE_CHECKING:
+    from app.memory.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Protocol for LLM cache storage backends."""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def set(
+        self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None
+    ) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryLRU:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        # key -> (expires_at monotonic or None, value)
+        self._data: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(
+        self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None
+    ) -> None:
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend:
+    """Redis-backed cache shared across processes."""
+
+    KEY_PREFIX = "llm:cache:"
+
+    def __init__(self, client: Any):
+        """
+        Initialize Redis backend.
+
+        Args:
+            client: redis.asyncio.Redis client
+        """
+        self.client = client
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(self.KEY_PREFIX + key)
+        if raw is None:
+            return None
+        return orjson.loads(raw)
+
+    async def set(
+        self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None
+    ) -> None:
+        await self.client.set(self.KEY_PREFIX + key, orjson.dumps(value), ex=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.KEY_PREFIX + key)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.KEY_PREFIX + "*"):
+            await self.client.delete(key)
+
+
+class LLMCache:
+    """
+    Exact-match response cache for LLM calls.
+
+    Only deterministic requests (temperature <= 0) are cached; sampled
+    responses are expected to vary between calls.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl_seconds: int = 3600,
+        enabled: bool = True,
+    ):
+        """
+        Initialize LLM cache.
+
+        Args:
+            backend: Storage backend (defaults to InMemoryLRU)
+            ttl_seconds: Entry time-to-live
+            enabled: Disable to bypass the cache entirely
+        """
+        self.backend = backend or InMemoryLRU()
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0}
+
+    def cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[str]:
+        """
+        Build a cache key for a request.
+
+        Returns:
+            Hex digest key, or None if the request is not cacheable
+        """
+        if not self.enabled or temperature > 0:
+            return None
+
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "system_instruction": system_instruction,
+                "tools": tools,
+                "temperature": temperature,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, recording hit/miss stats."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache get failed: {e}")
+            value = None
+
+        if value is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response."""
+        try:
+            await self.backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"LLM cache set failed: {e}")
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        await self.backend.clear()
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for the semantic cache."""
+
+    similarity_threshold: float = 0.92
+    ttl: int = 3600
+    enabled: bool = True
+    max_entries: int = 512
+    # Generative reuse: adapt a near-miss heavy-tier answer with the light model
+    generative: bool = False
+    generative_threshold: float = 0.80
+
+
+@dataclass
+class SemanticEntry:
+    """A cached response with its prompt embedding."""
+
+    embedding: List[float]  # L2-normalized
+    response: Dict[str, Any]
+    model_name: str
+    system_instruction: Optional[str]
+    expires_at: float
+    source_tier: Optional[str] = None
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for LLM responses.
+
+    Prompts are embedded with the shared EmbeddingService and compared by
+    cosine similarity against recent entries for the same model and system
+    instruction. Only use for deterministic single-turn requests.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheConfig] = None,
+        embedding_service: Optional["EmbeddingService"] = None,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            config: Cache configuration
+            embedding_service: Embedding provider (defaults to the global service)
+        """
+        self.config = config or CacheConfig()
+        self._embedding_service = embedding_service
+        self._entries: List[SemanticEntry] = []
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    async def embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed and L2-normalize a prompt. Returns None if embedding fails."""
+        if self._embedding_service is None:
+            from app.memory.embedding_service import get_embedding_service
+
+            self._embedding_service = get_embedding_service()
+
+        try:
+            vector = await self._embedding_service.embed_text(
+                prompt, task_type=self._embedding_service.TASK_SEMANTIC_SIMILARITY
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return None
+        return [v / norm for v in vector]
+
+    def nearest(
+        self,
+        embedding: List[float],
+        model_name: str,
+        system_instruction: Optional[str] = None,
+    ) -> Optional[Tuple[float, SemanticEntry]]:
+        """Find the most similar live entry for the same model and system instruction."""
+        now = time.monotonic()
+        self._entries = [e for e in self._entries if e.expires_at > now]
+
+        best: Optional[Tuple[float, SemanticEntry]] = None
+        for entry in self._entries:
+            if entry.model_name != model_name or entry.system_instruction != system_instruction:
+                continue
+            score = sum(a * b for a, b in zip(embedding, entry.embedding))
+            if best is None or score > best[0]:
+                best = (score, entry)
+        return best
+
+    def get(
+        self,
+        embedding: List[float],
+        model_name: str,
+        system_instruction: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached response if one is above the similarity threshold."""
+        match = self.nearest(embedding, model_name, system_instruction)
+        if match and match[0] >= self.config.similarity_threshold:
+            self.stats["hits"] += 1
+            return match[1].response
+        self.stats["misses"] += 1
+        return None
+
+    def generative_candidate(
+        self,
+        embedding: List[float],
+        system_instruction: Optional[str] = None,
+    ) -> Optional[SemanticEntry]:
+        """
+        Find a heavy-tier entry close enough to adapt but below the hit threshold.
+
+        Returns None unless generative reuse is enabled.
+        """
+        if not self.config.generative:
+            return None
+
+        now = time.monotonic()
+        best: Optional[Tuple[float, SemanticEntry]] = None
+        for entry in self._entries:
+            if (
+                entry.source_tier != "heavy"
+                or entry.expires_at <= now
+                or entry.system_instruction != system_instruction
+            ):
+                continue
+            score = sum(a * b for a, b in zip(embedding, entry.embedding))
+            if best is None or score > best[0]:
+                best = (score, entry)
+
+        if best and self.config.generative_threshold <= best[0] < self.config.similarity_threshold:
+            self.stats["generative"] = self.stats.get("generative", 0) + 1
+            return best[1]
+        return None
+
+    def add(
+        self,
+        embedding: List[float],
+        response: Dict[str, Any],
+        model_name: str,
+        system_instruction: Optional[str] = None,
+        source_tier: Optional[str] = None,
+    ) -> None:
+        """Store a response, evicting the oldest entry when full."""
+        self._entries.append(
+            SemanticEntry(
+                embedding=embedding,
+                response=response,
+                model_name=model_name,
+                system_instruction=system_instruction,
+                expires_at=time.monotonic() + self.config.ttl,
+                source_tier=source_tier,
+            )
+        )
+        if len(self._entries) > self.config.max_entries:
+            del self._entries[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+@dataclass
+class ToolCallCluster:
+    """A group of similar tool-calling prompts and the calls they produced."""
+
+    centroid: List[float]  # L2-normalized
+    tools_key: Tuple[str, ...]
+    model_name: str
+    system_instruction: Optional[str]
+    size: int = 0
+    # Canonical function-call signature -> occurrences
+    signatures: Counter = field(default_factory=Counter)
+
+
+class ToolCallClusterCache:
+    """
+    Cluster cache for generate_with_tools.
+
+    Prompts sharing a toolset, model and system instruction are clustered by
+    embedding similarity. Once a cluster has seen ``min_examples`` prompts
+    and at least ``agreement`` of them produced the same function calls,
+    new prompts in that cluster are answered with those calls directly.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        join_threshold: float = 0.85,
+        min_examples: int = 10,
+        agreement: float = 0.9,
+        max_clusters: int = 256,
+    ):
+        """
+        Initialize cluster cache.
+
+        Args:
+            enabled: Disabled by default; enable for repetitive tool-call workloads
+            join_threshold: Minimum cosine similarity to join an existing cluster
+            min_examples: Prompts a cluster must see before it answers
+            agreement: Share of a cluster's prompts that must agree on the calls
+            max_clusters: Oldest clusters are dropped beyond this count
+        """
+        self.enabled = enabled
+        self.join_threshold = join_threshold
+        self.min_examples = min_examples
+        self.agreement = agreement
+        self.max_clusters = max_clusters
+        self._clusters: List[ToolCallCluster] = []
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def tools_key(tools: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        """Identify a toolset by its tool names."""
+        return tuple(sorted(tool["name"] for tool in tools))
+
+    @staticmethod
+    def _signature(function_calls: List[Dict[str, Any]]) -> bytes:
+        """Canonical form of a call list, ignoring provider-assigned call ids."""
+        return orjson.dumps(
+            [{"name": c.get("name"), "args": c.get("args", {})} for c in function_calls],
+            option=orjson.OPT_SORT_KEYS,
+        )
+
+    def _nearest(
+        self,
+        embedding: List[float],
+        tools_key: Tuple[str, ...],
+        model_name: str,
+        system_instruction: Optional[str],
+    ) -> Optional[ToolCallCluster]:
+        best: Optional[Tuple[float, ToolCallCluster]] = None
+        for cluster in self._clusters:
+            if (
+                cluster.tools_key != tools_key
+                or cluster.model_name != model_name
+                or cluster.system_instruction != system_instruction
+            ):
+                continue
+            score = sum(a * b for a, b in zip(embedding, cluster.centroid))
+            if best is None or score > best[0]:
+                best = (score, cluster)
+        if best and best[0] >= self.join_threshold:
+            return best[1]
+        return None
+
+    def get(
+        self,
+        embedding: List[float],
+        tools_key: Tuple[str, ...],
+        model_name: str,
+        system_instruction: Optional[str] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the function calls of a converged cluster, if any.
+
+        Replayed calls get fresh ids, so callers matching tool results back
+        to calls by id never see a collision.
+        """
+        cluster = self._nearest(embedding, tools_key, model_name, system_instruction)
+        if cluster and cluster.size >= self.min_examples:
+            signature, count = cluster.signatures.most_common(1)[0]
+            if count / cluster.size >= self.agreement:
+                self.stats["hits"] += 1
+                return [
+                    {"id": f"cached_{uuid4().hex}", "name": call["name"], "args": call["args"]}
+                    for call in orjson.loads(signature)
+                ]
+        self.stats["misses"] += 1
+        return None
+
+    def add(
+        self,
+        embedding: List[float],
+        tools_key: Tuple[str, ...],
+        model_name: str,
+        function_calls: List[Dict[str, Any]],
+        system_instruction: Optional[str] = None,
+    ) -> None:
+        """Record the calls produced for a prompt, joining or creating a cluster."""
+        cluster = self._nearest(embedding, tools_key, model_name, system_instruction)
+        if cluster is None:
+            cluster = ToolCallCluster(
+                centroid=list(embedding),
+                tools_key=tools_key,
+                model_name=model_name,
+                system_instruction=system_instruction,
+            )
+            self._clusters.append(cluster)
+            if len(self._clusters) > self.max_clusters:
+                del self._clusters[0]
+        else:
+            # Running mean, re-normalized so dot products stay cosine similarities
+            n = cluster.size
+            centroid = [(c * n + e) / (n + 1) for c, e in zip(cluster.centroid, embedding)]
+            norm = math.sqrt(sum(v * v for v in centroid)) or 1.0
+            cluster.centroid = [v / norm for v in centroid]
+
+        cluster.size += 1
+        cluster.signatures[self._signature(function_calls)] += 1
+
+    def clear(self) -> None:
+        """Remove all clusters."""
+        self._clusters.clear()
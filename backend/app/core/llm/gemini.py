@@ -2,16 +2,79 @@
 Gemini API Client
 """
 
-from typing import Any, Dict, List, Optional
+import functools
+from collections import OrderedDict
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import google.generativeai as genai
+import orjson
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# Whether genai.configure() has run for this process
+_configured = False
+
+# Model cache key: (system instruction, sorted tool names)
+_ModelKey = Tuple[Optional[str], Tuple[str, ...]]
+
+
+def _load_genai() -> ModuleType:
+    """
+    Import the Gemini SDK on first use and configure the API key once.
+
+    The SDK pulls in gRPC/protobuf, so Anthropic-only deployments never pay
+    for the import.
+    """
+    global _configured
+    import google.generativeai as genai
+
+    if not _configured and settings.gemini_api_key:
+        genai.configure(api_key=settings.gemini_api_key)
+        _configured = True
+    return genai
+
+
+@functools.lru_cache(maxsize=64)
+def _gemini_tools_cached(tools_key: Tuple[Tuple[str, str, bytes], ...]) -> List[Any]:
+    """Build Gemini tool protos for a tools key of (name, description, schema JSON)."""
+    genai = _load_genai()
+    return [
+        genai.protos.Tool(
+            function_declarations=[
+                genai.protos.FunctionDeclaration(
+                    name=name,
+                    description=description,
+                    parameters=orjson.loads(schema),
+                )
+            ]
+        )
+        for name, description, schema in tools_key
+    ]
+
+
+def _to_gemini_tools(tools: List[Dict[str, Any]]) -> List[Any]:
+    """Convert tool definitions to Gemini format (memoized per toolset)."""
+    return _gemini_tools_cached(
+        tuple(
+            (
+                tool["name"],
+                tool["description"],
+                orjson.dumps(tool.get("parameters")),
+            )
+            for tool in tools
+        )
+    )
+
 
 class GeminiClient:
     """Client for Google Gemini API."""
 
+    # Max configured models kept per client (keyed by system instruction + tools)
+    MODEL_CACHE_SIZE = 32
+
     def __init__(self, model_name: str = "gemini-2.0-flash"):
         """
         Initialize Gemini client.
@@ -20,25 +83,49 @@ class GeminiClient:
             model_name: Model to use (gemini-2.0-flash or gemini-2.0-pro)
         """
         self.model_name = model_name
-        self._model: Optional[genai.GenerativeModel] = None
-
-        # Configure API key
-        if settings.gemini_api_key:
-            genai.configure(api_key=settings.gemini_api_key)
+        self._genai = _load_genai()
+        self._model: Optional["genai.GenerativeModel"] = None
+        self._model_cache: "OrderedDict[_ModelKey, genai.GenerativeModel]" = OrderedDict()
 
     @property
-    def model(self) -> genai.GenerativeModel:
+    def model(self) -> "genai.GenerativeModel":
         """Get or create the model instance."""
         if self._model is None:
-            self._model = genai.GenerativeModel(self.model_name)
+            self._model = self._genai.GenerativeModel(self.model_name)
         return self._model
 
+    def _get_model(
+        self,
+        system_instruction: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> "genai.GenerativeModel":
+        """Get a model configured with the given system instruction and tools."""
+        if not system_instruction and not tools:
+            return self.model
+
+        key = (system_instruction, tuple(sorted(tool["name"] for tool in tools or [])))
+        model = self._model_cache.get(key)
+        if model is not None:
+            self._model_cache.move_to_end(key)
+            return model
+
+        model = self._genai.GenerativeModel(
+            self.model_name,
+            system_instruction=system_instruction,
+            tools=_to_gemini_tools(tools) if tools else None,
+        )
+        self._model_cache[key] = model
+        if len(self._model_cache) > self.MODEL_CACHE_SIZE:
+            self._model_cache.popitem(last=False)
+        return model
+
     async def generate(
         self,
         prompt: str,
         system_instruction: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        cached_segments: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate content from prompt.
@@ -48,23 +135,23 @@ class GeminiClient:
             system_instruction: System instruction for the model
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            cached_segments: Static instructions appended to the system
+                instruction (the configured model is reused per combination)
 
         Returns:
             Dict with text and token usage
         """
-        generation_config = genai.GenerationConfig(
+        if cached_segments:
+            system_instruction = "\n\n".join(
+                filter(None, [system_instruction, *cached_segments])
+            )
+
+        generation_config = self._genai.GenerationConfig(
             temperature=temperature,
             max_output_tokens=max_tokens,
         )
 
-        # Create model with system instruction if provided
-        if system_instruction:
-            model = genai.GenerativeModel(
-                self.model_name,
-                system_instruction=system_instruction,
-            )
-        else:
-            model = self.model
+        model = self._get_model(system_instruction)
 
         response = await model.generate_content_async(
             prompt,
@@ -99,26 +186,7 @@ class GeminiClient:
         Returns:
             Dict with response and potential function calls
         """
-        # Convert tools to Gemini format
-        gemini_tools = []
-        for tool in tools:
-            gemini_tools.append(
-                genai.protos.Tool(
-                    function_declarations=[
-                        genai.protos.FunctionDeclaration(
-                            name=tool["name"],
-                            description=tool["description"],
-                            parameters=tool.get("parameters"),
-                        )
-                    ]
-                )
-            )
-
-        model = genai.GenerativeModel(
-            self.model_name,
-            system_instruction=system_instruction,
-            tools=gemini_tools,
-        )
+        model = self._get_model(system_instruction, tools)
 
         response = await model.generate_content_async(prompt)
 
@@ -0,0 +1,42 @@
+"""
+Shared HTTP Client for LLM Providers
+
+A single pooled httpx.AsyncClient reused by all LLM clients so TCP/TLS
+connections are kept alive across requests instead of being re-established
+per client instance.
+
+HTTP/2 is negotiated when the endpoint supports it, so concurrent requests
+(including streams) are multiplexed over a single connection.
+"""
+
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300,
+            ),
+            http2=settings.llm_http2,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
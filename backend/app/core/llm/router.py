@@ -6,10 +6,23 @@ Supports multiple LLM providers:
 - Google Gemini (direct API)
 """
 
+import asyncio
+import random
 from enum import Enum
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+    runtime_checkable,
+)
 
 from app.config import settings
+from app.core.llm.cache import CacheConfig, LLMCache, SemanticCache, ToolCallClusterCache
 
 
 class ModelTier(str, Enum):
@@ -19,6 +32,32 @@ class ModelTier(str, Enum):
     HEAVY = "heavy"  # High quality, more expensive
 
 
+# Tasks that should use the light model
+LIGHT_TASKS = frozenset({
+    "filter",
+    "classify",
+    "extract_keywords",
+    "simple_qa",
+    "summarize_short",
+    "sentiment_basic",
+})
+
+# Tasks that should use the heavy model
+HEAVY_TASKS = frozenset({
+    "critical_review",
+    "deep_analysis",
+    "synthesis",
+    "complex_reasoning",
+    "cross_validation",
+})
+
+# Precomputed task -> tier routing table
+_TASK_TIER: Dict[str, ModelTier] = {
+    **{task: ModelTier.LIGHT for task in LIGHT_TASKS},
+    **{task: ModelTier.HEAVY for task in HEAVY_TASKS},
+}
+
+
 @runtime_checkable
 class LLMClient(Protocol):
     """Protocol for LLM clients."""
@@ -31,6 +70,7 @@ class LLMClient(Protocol):
         system_instruction: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        cached_segments: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         ...
 
@@ -56,39 +96,45 @@ class LLMRouter:
     - Heavy: High quality for complex analysis, synthesis, reasoning
     """
 
-    # Tasks that should use the light model
-    LIGHT_TASKS = {
-        "filter",
-        "classify",
-        "extract_keywords",
-        "simple_qa",
-        "summarize_short",
-        "sentiment_basic",
-    }
-
-    # Tasks that should use the heavy model
-    HEAVY_TASKS = {
-        "critical_review",
-        "deep_analysis",
-        "synthesis",
-        "complex_reasoning",
-        "cross_validation",
-    }
+    LIGHT_TASKS = LIGHT_TASKS
+    HEAVY_TASKS = HEAVY_TASKS
 
     # Content length threshold for auto-routing
     CONTENT_LENGTH_THRESHOLD = 5000
 
-    def __init__(self, provider: Optional[str] = None):
+    # Retry policy for batch_generate (rate limits and transient server errors)
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    BATCH_MAX_RETRIES = 3
+    BATCH_BACKOFF_MAX_S = 30.0
+
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        tool_cluster_cache: Optional[ToolCallClusterCache] = None,
+    ):
         """
         Initialize LLM Router.
 
         Args:
             provider: LLM provider to use ("anthropic" or "gemini").
                      Defaults to settings.llm_provider
+            cache: Response cache for deterministic requests.
+                   Defaults to an in-memory LRU with 1h TTL
+            semantic_cache: Similarity cache for paraphrased deterministic prompts.
+                   Enabled by default only when an embedding API key is configured
+            tool_cluster_cache: Cluster cache for repetitive tool calls.
+                   Disabled by default
         """
         self.provider = provider or settings.llm_provider
         self._light: Optional[LLMClient] = None
         self._heavy: Optional[LLMClient] = None
+        self.cache = cache or LLMCache(ttl_seconds=3600)
+        self.semantic_cache = semantic_cache or SemanticCache(
+            CacheConfig(enabled=bool(settings.gemini_api_key))
+        )
+        self.tool_cluster_cache = tool_cluster_cache or ToolCallClusterCache()
 
     @property
     def light(self) -> LLMClient:
@@ -111,7 +157,7 @@ class LLMRouter:
 
             model = (
                 settings.claude_model_light
-                if tier == ModelTier.LIGHT
+                if tier is ModelTier.LIGHT
                 else settings.claude_model_heavy
             )
             return AnthropicClient(
@@ -123,18 +169,18 @@ class LLMRouter:
             from app.core.llm.gemini import GeminiClient
 
             model = (
-                "gemini-2.0-flash" if tier == ModelTier.LIGHT else "gemini-2.0-pro"
+                "gemini-2.0-flash" if tier is ModelTier.LIGHT else "gemini-2.0-pro"
             )
             return GeminiClient(model_name=model)
 
-    def get_client(
+    def resolve_tier(
         self,
         task: Optional[str] = None,
         content_length: Optional[int] = None,
         force_tier: Optional[ModelTier] = None,
-    ) -> LLMClient:
+    ) -> ModelTier:
         """
-        Get appropriate client based on task or content.
+        Decide which model tier should handle a request.
 
         Args:
             task: Task type (e.g., "filter", "deep_analysis")
@@ -142,25 +188,48 @@ class LLMRouter:
             force_tier: Force a specific model tier
 
         Returns:
-            Appropriate LLM client instance
+            Model tier to use
         """
         # If tier is forced, use it
         if force_tier:
-            return self.light if force_tier == ModelTier.LIGHT else self.heavy
+            return force_tier
 
-        # Route based on task type
-        if task:
-            if task in self.LIGHT_TASKS:
-                return self.light
-            elif task in self.HEAVY_TASKS:
-                return self.heavy
-
-        # Route based on content length
-        if content_length and content_length > self.CONTENT_LENGTH_THRESHOLD:
-            return self.heavy
+        # Route based on task type, then on content length
+        tier = _TASK_TIER.get(task) if task else None
+        if tier is None and content_length and content_length > self.CONTENT_LENGTH_THRESHOLD:
+            tier = ModelTier.HEAVY
 
         # Default to light model for efficiency
-        return self.light
+        return tier or ModelTier.LIGHT
+
+    def select(
+        self,
+        task: Optional[str] = None,
+        content_length: Optional[int] = None,
+        force_tier: Optional[ModelTier] = None,
+    ) -> Tuple[LLMClient, ModelTier]:
+        """Get the appropriate client together with its tier."""
+        tier = self.resolve_tier(task, content_length, force_tier)
+        return (self.heavy if tier is ModelTier.HEAVY else self.light), tier
+
+    def get_client(
+        self,
+        task: Optional[str] = None,
+        content_length: Optional[int] = None,
+        force_tier: Optional[ModelTier] = None,
+    ) -> LLMClient:
+        """
+        Get appropriate client based on task or content.
+
+        Args:
+            task: Task type (e.g., "filter", "deep_analysis")
+            content_length: Length of content to process
+            force_tier: Force a specific model tier
+
+        Returns:
+            Appropriate LLM client instance
+        """
+        return self.select(task, content_length, force_tier)[0]
 
     async def generate(
         self,
@@ -168,6 +237,8 @@ class LLMRouter:
         task: Optional[str] = None,
         system_instruction: Optional[str] = None,
         force_tier: Optional[ModelTier] = None,
+        prompt_length: Optional[int] = None,
+        cached_segments: Optional[List[str]] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         """
@@ -178,17 +249,62 @@ class LLMRouter:
             task: Task type for routing
             system_instruction: System instruction
             force_tier: Force a specific model tier
+            prompt_length: Prompt length for routing, if already known upstream
+            cached_segments: Static prompt segments (e.g. output schemas) that
+                the provider can cache as a prefix; only the prompt varies
             **kwargs: Additional arguments for generation
 
         Returns:
             Generation result with model info
         """
-        client = self.get_client(
+        client, tier = self.select(
             task=task,
-            content_length=len(prompt),
+            content_length=prompt_length if prompt_length is not None else len(prompt),
             force_tier=force_tier,
         )
 
+        # Cached segments are part of the instructions for cache identity
+        instruction_key = system_instruction
+        if cached_segments:
+            instruction_key = "\n\n".join(filter(None, [system_instruction, *cached_segments]))
+            kwargs["cached_segments"] = cached_segments
+
+        # Deterministic requests (temperature <= 0) are served from cache;
+        # the key is only hashed when the request is cacheable at all
+        temperature = kwargs.get("temperature", 0.7)
+        cache_key = None
+        if self.cache.enabled and temperature <= 0:
+            cache_key = self.cache.cache_key(
+                client.model_name,
+                [{"role": "user", "content": prompt}],
+                temperature,
+                system_instruction=instruction_key,
+            )
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cache": "hit"}
+
+        # Fall back to a similarity lookup for paraphrased prompts
+        embedding = None
+        if temperature <= 0 and self.semantic_cache.enabled:
+            embedding = await self.semantic_cache.embed(prompt)
+            if embedding is not None:
+                cached = self.semantic_cache.get(
+                    embedding, client.model_name, instruction_key
+                )
+                if cached is not None:
+                    return {**cached, "cache": "semantic"}
+
+                # Near miss on a heavy-tier answer: let the light model adapt it
+                candidate = self.semantic_cache.generative_candidate(
+                    embedding, instruction_key
+                )
+                if candidate is not None and candidate.response.get("text"):
+                    return await self._generate_from_cached(
+                        prompt, candidate.response["text"], system_instruction, **kwargs
+                    )
+
         result = await client.generate(
             prompt=prompt,
             system_instruction=system_instruction,
@@ -197,11 +313,125 @@ class LLMRouter:
 
         # Add model info to result
         result["model"] = client.model_name
-        result["tier"] = "light" if client == self.light else "heavy"
+        result["tier"] = tier.value
         result["provider"] = self.provider
 
+        if cache_key:
+            await self.cache.set(cache_key, result)
+        if embedding is not None:
+            self.semantic_cache.add(
+                embedding, result, client.model_name, instruction_key, source_tier=tier.value
+            )
+
         return result
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        task: Optional[str] = None,
+        system_instruction: Optional[str] = None,
+        force_tier: Optional[ModelTier] = None,
+        prompt_length: Optional[int] = None,
+        cached_segments: Optional[List[str]] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text from the appropriate model.
+
+        Routing matches generate(); the response caches are bypassed.
+        Clients without streaming support (Gemini) yield their whole
+        response as a single chunk.
+
+        Yields:
+            Text chunks as they are generated
+        """
+        client, _ = self.select(
+            task=task,
+            content_length=prompt_length if prompt_length is not None else len(prompt),
+            force_tier=force_tier,
+        )
+        if cached_segments:
+            kwargs["cached_segments"] = cached_segments
+
+        stream = getattr(client, "generate_stream", None)
+        if stream is None:
+            result = await client.generate(
+                prompt=prompt, system_instruction=system_instruction, **kwargs
+            )
+            yield result["text"]
+            return
+
+        async for chunk in stream(
+            prompt=prompt, system_instruction=system_instruction, **kwargs
+        ):
+            yield chunk
+
+    async def _generate_from_cached(
+        self,
+        prompt: str,
+        cached_text: str,
+        system_instruction: Optional[str] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Answer a prompt with the light model, grounded on a similar cached answer."""
+        result = await self.light.generate(
+            prompt=(
+                f"Given the previous answer: {cached_text}\n\n"
+                f"Answer the new question: {prompt}"
+            ),
+            system_instruction=system_instruction,
+            **kwargs,
+        )
+        result["model"] = self.light.model_name
+        result["tier"] = ModelTier.LIGHT.value
+        result["provider"] = self.provider
+        result["cache"] = "generative"
+        return result
+
+    async def batch_generate(
+        self,
+        prompts: List[str],
+        task: Optional[str] = None,
+        max_concurrency: int = 10,
+        **kwargs,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Generate completions for many prompts concurrently.
+
+        Args:
+            prompts: User prompts
+            task: Task type for routing (applies to all prompts)
+            max_concurrency: Maximum in-flight requests; keep within the
+                provider's rate limits
+            **kwargs: Additional arguments passed to generate()
+
+        Returns:
+            Results in prompt order; a failed prompt yields its exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._generate_with_retry(prompt, task=task, **kwargs)
+
+        return await asyncio.gather(
+            *(run_one(prompt) for prompt in prompts),
+            return_exceptions=True,
+        )
+
+    async def _generate_with_retry(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Call generate(), retrying 429/5xx responses with jittered exponential backoff."""
+        for attempt in range(self.BATCH_MAX_RETRIES + 1):
+            try:
+                return await self.generate(prompt, **kwargs)
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status not in self.RETRYABLE_STATUS_CODES or attempt == self.BATCH_MAX_RETRIES:
+                    raise
+                backoff = min(2**attempt, self.BATCH_BACKOFF_MAX_S)
+                await asyncio.sleep(backoff * (0.5 + random.random() / 2))
+        raise RuntimeError("unreachable")
+
     async def generate_with_tools(
         self,
         prompt: str,
@@ -209,6 +439,7 @@ class LLMRouter:
         task: Optional[str] = None,
         system_instruction: Optional[str] = None,
         force_tier: Optional[ModelTier] = None,
+        prompt_length: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Generate content with function calling.
@@ -219,16 +450,38 @@ class LLMRouter:
             task: Task type for routing
             system_instruction: System instruction
             force_tier: Force a specific model tier
+            prompt_length: Prompt length for routing, if already known upstream
 
         Returns:
             Generation result with potential function calls
         """
-        client = self.get_client(
+        client, tier = self.select(
             task=task,
-            content_length=len(prompt),
+            content_length=prompt_length if prompt_length is not None else len(prompt),
             force_tier=force_tier,
         )
 
+        # Prompts in a converged cluster are answered without a model call
+        embedding = None
+        tools_key = None
+        if self.tool_cluster_cache.enabled:
+            tools_key = self.tool_cluster_cache.tools_key(tools)
+            embedding = await self.semantic_cache.embed(prompt)
+            if embedding is not None:
+                calls = self.tool_cluster_cache.get(
+                    embedding, tools_key, client.model_name, system_instruction
+                )
+                if calls is not None:
+                    return {
+                        "text": None,
+                        "function_calls": calls,
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0},
+                        "model": client.model_name,
+                        "tier": tier.value,
+                        "provider": self.provider,
+                        "cache": "cluster",
+                    }
+
         result = await client.generate_with_tools(
             prompt=prompt,
             tools=tools,
@@ -236,9 +489,18 @@ class LLMRouter:
         )
 
         result["model"] = client.model_name
-        result["tier"] = "light" if client == self.light else "heavy"
+        result["tier"] = tier.value
         result["provider"] = self.provider
 
+        if embedding is not None and result.get("function_calls"):
+            self.tool_cluster_cache.add(
+                embedding,
+                tools_key,
+                client.model_name,
+                result["function_calls"],
+                system_instruction,
+            )
+
         return result
 
 
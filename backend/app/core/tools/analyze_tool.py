@@ -4,8 +4,19 @@ Analyze Tool
 Analyzes collected data using LLM.
 """
 
-from typing import Any, Dict, List, TYPE_CHECKING
-
+import asyncio
+import hashlib
+import heapq
+import re
+from collections import Counter
+from io import StringIO
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import orjson
+
+from app.config import settings
+from app.core.llm.cache import CacheConfig, InMemoryLRU, SemanticCache
 from app.core.tools.base import BaseTool, ToolParameter, ToolResult
 
 if TYPE_CHECKING:
@@ -23,6 +34,149 @@ ANALYZE_SYSTEM_PROMPT = """你是一个专业的情报分析师，负责分析
 
 请以结构化的 JSON 格式返回分析结果。"""
 
+# JSON extraction from LLM responses
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.+?)\s*```", re.S)
+_JSON_OBJ_RE = re.compile(r"[\{\[].*[\}\]]", re.S)
+
+_PROMPT_PREFIX = "请分析以下收集到的信息：\n\n"
+
+# Output schema instructions per analysis type. Sent as cached prompt segments
+# after the system prompt, so only the collected data varies between calls.
+_SCHEMA_TAILS: Dict[str, str] = {
+    "sentiment": """请分析每条信息的情感倾向，并返回 JSON 格式：
+{
+    "overall_sentiment": "positive/negative/neutral",
+    "sentiment_score": 0.0-1.0,
+    "items": [{"id": 1, "sentiment": "positive/negative/neutral", "confidence": 0.0-1.0}]
+}""",
+    "summary": """请总结这些信息的核心内容，返回 JSON 格式：
+{
+    "main_points": ["要点1", "要点2", ...],
+    "key_entities": ["实体1", "实体2", ...],
+    "timeline": "时间线描述",
+    "brief_summary": "100字以内的简短总结"
+}""",
+    "extract_entities": """请提取所有提到的实体（公司、产品、人物），返回 JSON 格式：
+{
+    "companies": [{"name": "公司名", "mentions": 次数, "context": "相关上下文"}],
+    "products": [{"name": "产品名", "company": "所属公司", "mentions": 次数}],
+    "persons": [{"name": "人名", "role": "角色", "mentions": 次数}]
+}""",
+    "full": """请进行全面分析，返回 JSON 格式：
+{
+    "summary": "综合摘要",
+    "main_points": ["要点列表"],
+    "sentiment": {"overall": "positive/negative/neutral", "score": 0.0-1.0},
+    "entities": {"companies": [], "products": [], "persons": []},
+    "credibility_assessment": {"high": [], "medium": [], "low": []},
+    "contradictions": ["发现的矛盾信息"],
+    "recommendations": ["建议的后续行动"]
+}""",
+}
+
+# Item fields, in order of preference, used to rank inputs beyond max_items
+_SCORE_FIELDS = ("importance_score", "relevance_score", "score")
+
+
+def _item_score(item: Dict[str, Any]) -> Optional[float]:
+    """Ranking score of an input item, or None if it has none."""
+    for field in _SCORE_FIELDS:
+        value = item.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    return None
+
+
+# Receives (field name, element) for each closed element of a top-level array
+PartialCallback = Callable[[str, Any], None]
+
+
+class _PartialJSONScanner:
+    """
+    Incremental scanner for a streamed JSON object.
+
+    Tracks string/escape state and bracket nesting as chunks arrive, and
+    returns each element of a top-level array field (e.g. ``items`` or
+    ``main_points``) as soon as it closes. Text before the first ``{``
+    (such as a code fence) is skipped.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._in_string = False
+        self._escape_next = False
+        self._string_start = -1
+        self._stack: List[str] = []
+        self._key = ""
+        self._elem_start = -1
+
+    def _in_field_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[1] == "["
+
+    def _close_element(self, end: int, out: List[Tuple[str, Any]]) -> None:
+        try:
+            out.append((self._key, orjson.loads(self.buffer[self._elem_start : end].strip())))
+        except orjson.JSONDecodeError:
+            pass
+        self._elem_start = -1
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk; return the (field, element) pairs it completed."""
+        self.buffer += chunk
+        buf = self.buffer
+        completed: List[Tuple[str, Any]] = []
+
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if not self._started:
+                if c != "{":
+                    continue
+                self._started = True
+
+            if self._in_string:
+                if self._escape_next:
+                    self._escape_next = False
+                elif c == "\\":
+                    self._escape_next = True
+                elif c == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        # A key, or a value (only keys are followed by "[")
+                        self._key = buf[self._string_start + 1 : i]
+                    elif self._elem_start == self._string_start and self._in_field_array():
+                        self._close_element(i + 1, completed)
+                continue
+
+            in_array = self._in_field_array()
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                if in_array and self._elem_start < 0:
+                    self._elem_start = i
+            elif c in "{[":
+                if in_array and self._elem_start < 0:
+                    self._elem_start = i
+                self._stack.append(c)
+            elif c in "}]":
+                if in_array and self._elem_start >= 0:
+                    # Scalar element ended by the closing bracket
+                    self._close_element(i, completed)
+                if self._stack:
+                    self._stack.pop()
+                if self._in_field_array() and self._elem_start >= 0:
+                    self._close_element(i + 1, completed)
+            elif in_array:
+                if c == ",":
+                    if self._elem_start >= 0:
+                        self._close_element(i, completed)
+                elif self._elem_start < 0 and not c.isspace():
+                    self._elem_start = i
+
+        self._pos = len(buf)
+        return completed
+
 
 class AnalyzeTool(BaseTool):
     """
@@ -31,8 +185,77 @@ class AnalyzeTool(BaseTool):
     Analyzes collected data for sentiment, key points, and insights.
     """
 
-    def __init__(self, llm_router: "LLMRouter"):
+    __slots__ = (
+        "llm",
+        "max_items",
+        "batch_size",
+        "max_concurrency",
+        "light_token_limit",
+        "heavy_token_limit",
+        "cache_enabled",
+        "cache_ttl",
+        "_cache",
+        "_semantic_cache",
+    )
+
+    # Default max items analyzed per execute call
+    MAX_ITEMS = 20
+
+    # Per-item analyses, safe to split into mini-batches; summary and full
+    # judge across items (contradictions, timeline) so they see every item
+    BATCHED_TYPES = frozenset({"sentiment", "extract_entities"})
+
+    # Labels merged by (weighted) majority vote across batches
+    SENTIMENT_LABELS = frozenset({"positive", "negative", "neutral"})
+
+    def __init__(
+        self,
+        llm_router: "LLMRouter",
+        max_items: int = MAX_ITEMS,
+        batch_size: int = 10,
+        max_concurrency: int = 4,
+        light_token_limit: int = 500,
+        heavy_token_limit: int = 2000,
+        cache_enabled: bool = True,
+        cache_similarity_threshold: float = 0.92,
+        cache_ttl: int = 3600,
+    ):
+        """
+        Initialize analyze tool.
+
+        Args:
+            llm_router: LLM router for analysis calls
+            max_items: Max items analyzed per call; larger inputs keep the
+                highest-scored items (or the first ones if none are scored)
+            batch_size: Items per LLM call for per-item analysis types
+                (BATCHED_TYPES); larger inputs are split into mini-batches
+                analyzed concurrently and merged
+            max_concurrency: Maximum concurrent batch calls
+            light_token_limit: Estimated input tokens below which the light
+                model is always used
+            heavy_token_limit: Estimated input tokens from which the heavy
+                model is always used
+            cache_enabled: Reuse analyses of identical (and, when embeddings
+                are configured, near-identical) batches
+            cache_similarity_threshold: Cosine similarity for a near-duplicate hit
+            cache_ttl: Cached analysis lifetime in seconds
+        """
         self.llm = llm_router
+        self.max_items = max_items
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.light_token_limit = light_token_limit
+        self.heavy_token_limit = heavy_token_limit
+        self.cache_enabled = cache_enabled
+        self.cache_ttl = cache_ttl
+        self._cache = InMemoryLRU(maxsize=1024)
+        self._semantic_cache = SemanticCache(
+            CacheConfig(
+                similarity_threshold=cache_similarity_threshold,
+                ttl=cache_ttl,
+                enabled=cache_enabled and bool(settings.gemini_api_key),
+            )
+        )
 
     @property
     def name(self) -> str:
@@ -42,141 +265,287 @@ class AnalyzeTool(BaseTool):
     def description(self) -> str:
         return "分析收集到的数据，提取关键信息、情感倾向和重要洞察。"
 
-    @property
-    def parameters(self) -> List[ToolParameter]:
-        return [
-            ToolParameter(
-                name="data",
-                type="array",
-                description="要分析的数据列表",
-            ),
-            ToolParameter(
-                name="analysis_type",
-                type="string",
-                description="分析类型: sentiment, summary, extract_entities, full",
-                required=False,
-                enum=["sentiment", "summary", "extract_entities", "full"],
-            ),
-        ]
+    _PARAMETERS = (
+        ToolParameter(
+            name="data",
+            type="array",
+            description="要分析的数据列表",
+        ),
+        ToolParameter(
+            name="analysis_type",
+            type="string",
+            description="分析类型: sentiment, summary, extract_entities, full",
+            required=False,
+            enum=["sentiment", "summary", "extract_entities", "full"],
+        ),
+    )
 
     async def execute(
         self,
         data: List[Dict[str, Any]],
         analysis_type: str = "summary",
+        on_partial: Optional[PartialCallback] = None,
         **kwargs,
     ) -> ToolResult:
-        """Execute data analysis."""
+        """
+        Execute data analysis.
+
+        If ``on_partial`` is given, the analysis is streamed and the callback
+        receives (field, element) for each element of a top-level array
+        (e.g. a per-item sentiment) as soon as the model has produced it.
+        Streamed calls report no token usage.
+        """
         if not data:
             return ToolResult.ok(data={"analysis": "没有数据需要分析", "items": []})
 
-        # Prepare data for analysis
-        data_text = self._prepare_data_for_analysis(data)
+        items = self._select_items(data)
+        batch_size = self.batch_size if analysis_type in self.BATCHED_TYPES else max(len(items), 1)
+        batches = [
+            (start, items[start : start + batch_size])
+            for start in range(0, len(items), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        # Build analysis prompt based on type
-        prompt = self._build_analysis_prompt(data_text, analysis_type)
+        async def analyze_batch(
+            start: int, batch: List[Dict[str, Any]]
+        ) -> Tuple[Dict[str, Any], int]:
+            async with semaphore:
+                return await self._analyze_batch(batch, analysis_type, start + 1, on_partial)
 
         try:
-            # Use light model for basic analysis, heavy for full analysis
-            task = "simple_qa" if analysis_type in ("sentiment", "summary") else "deep_analysis"
-
-            result = await self.llm.generate(
-                prompt=prompt,
-                task=task,
-                system_instruction=ANALYZE_SYSTEM_PROMPT,
-                temperature=0.3,
+            results = await asyncio.gather(
+                *(analyze_batch(start, batch) for start, batch in batches)
             )
 
-            # Parse analysis result
-            analysis = self._parse_analysis_result(result["text"], analysis_type)
-            tokens_used = result["usage"]["prompt_tokens"] + result["usage"]["completion_tokens"]
+            analyses = [analysis for analysis, _ in results]
+            tokens_used = sum(tokens for _, tokens in results)
+            weights = [len(batch) for _, batch in batches]
 
             return ToolResult.ok(
-                data=analysis,
+                data=self._merge_batch_results(analyses, weights),
                 tokens_used=tokens_used,
             )
 
         except Exception as e:
             return ToolResult.fail(f"分析失败: {str(e)}")
 
-    def _prepare_data_for_analysis(self, data: List[Dict[str, Any]]) -> str:
+    def _select_items(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the max_items highest-scored items so the cap drops the least signal."""
+        if len(data) <= self.max_items or not any(
+            isinstance(item, dict) and _item_score(item) is not None for item in data
+        ):
+            return data[: self.max_items]
+        return heapq.nlargest(
+            self.max_items,
+            data,
+            key=lambda item: (_item_score(item) if isinstance(item, dict) else None) or 0,
+        )
+
+    async def _analyze_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        analysis_type: str,
+        first_id: int,
+        on_partial: Optional[PartialCallback] = None,
+    ) -> Tuple[Dict[str, Any], int]:
+        """Analyze one mini-batch. Item ids continue across batches."""
+        # Build the dynamic prompt; the per-type schema goes in a cached segment
+        data_text = self._prepare_data_for_analysis(batch, first_id)
+
+        # Repeated monitoring runs often re-analyze the same batch
+        cache_key = None
+        embedding = None
+        if self.cache_enabled:
+            cache_key = hashlib.blake2b(
+                f"{analysis_type}\0{data_text}".encode(), digest_size=16
+            ).hexdigest()
+            cached = await self._cache.get(cache_key)
+            if cached is None and self._semantic_cache.enabled:
+                # Embed every item: a prefix would match batches that only
+                # share their leading items
+                embedding = await self._semantic_cache.embed(data_text)
+                if embedding is not None:
+                    cached = self._semantic_cache.get(embedding, analysis_type)
+            if cached is not None:
+                if on_partial:
+                    self._replay_partials(cached, on_partial)
+                return cached, 0
+
+        request = {
+            "prompt": self._build_analysis_prompt(data_text, analysis_type),
+            "task": self._pick_task(data_text, analysis_type),
+            "system_instruction": ANALYZE_SYSTEM_PROMPT,
+            "cached_segments": [_SCHEMA_TAILS.get(analysis_type, _SCHEMA_TAILS["full"])],
+            "temperature": 0.3,
+        }
+
+        if on_partial:
+            scanner = _PartialJSONScanner()
+            async for chunk in self.llm.generate_stream(**request):
+                for field, element in scanner.feed(chunk):
+                    on_partial(field, element)
+            text, tokens_used = scanner.buffer, 0
+        else:
+            result = await self.llm.generate(**request)
+            text = result["text"]
+            tokens_used = result["usage"]["prompt_tokens"] + result["usage"]["completion_tokens"]
+
+        analysis = self._parse_analysis_result(text, analysis_type)
+
+        if cache_key and isinstance(analysis, dict) and not analysis.get("parsing_failed"):
+            await self._cache.set(cache_key, analysis, self.cache_ttl)
+            if embedding is not None:
+                self._semantic_cache.add(embedding, analysis, analysis_type)
+
+        return analysis, tokens_used
+
+    @staticmethod
+    def _replay_partials(analysis: Any, on_partial: PartialCallback) -> None:
+        """Emit the array elements of a cached analysis as partial results."""
+        if not isinstance(analysis, dict):
+            return
+        for field, value in analysis.items():
+            if isinstance(value, list):
+                for element in value:
+                    on_partial(field, element)
+
+    def _pick_task(self, data_text: str, analysis_type: str) -> str:
+        """Choose the routing task from the input size and analysis type."""
+        # Rough token estimate (CJK-heavy text runs ~1-3 chars per token)
+        tokens = len(data_text) // 3
+
+        if tokens < self.light_token_limit:
+            return "simple_qa"
+        if tokens >= self.heavy_token_limit:
+            return "deep_analysis"
+
+        # Use light model for basic analysis, heavy for full analysis
+        return "simple_qa" if analysis_type in ("sentiment", "summary") else "deep_analysis"
+
+    def _merge_batch_results(
+        self, analyses: List[Dict[str, Any]], weights: List[int]
+    ) -> Dict[str, Any]:
+        """Merge per-batch analyses into a single result."""
+        if len(analyses) == 1:
+            return analyses[0]
+
+        parsed = [
+            (a, w)
+            for a, w in zip(analyses, weights)
+            if isinstance(a, dict) and not a.get("parsing_failed")
+        ]
+        if not parsed:
+            return analyses[0]
+
+        merged = self._merge_values([a for a, _ in parsed], [w for _, w in parsed])
+        if len(parsed) < len(analyses):
+            merged["failed_batches"] = len(analyses) - len(parsed)
+        return merged
+
+    def _merge_values(self, values: List[Any], weights: List[int]) -> Any:
+        """
+        Merge one field across batches.
+
+        Dicts merge per key, lists concatenate (deduplicating strings and
+        summing mentions of named entities), numbers are averaged by batch
+        size, and sentiment labels go to the weighted majority.
+        """
+        first = values[0]
+
+        if isinstance(first, dict):
+            merged: Dict[str, Any] = {}
+            keys = dict.fromkeys(k for v in values if isinstance(v, dict) for k in v)
+            for key in keys:
+                pairs = [
+                    (v[key], w) for v, w in zip(values, weights) if isinstance(v, dict) and key in v
+                ]
+                merged[key] = self._merge_values([p[0] for p in pairs], [p[1] for p in pairs])
+            return merged
+
+        if isinstance(first, list):
+            return self._merge_lists(values)
+
+        if isinstance(first, (int, float)) and not isinstance(first, bool):
+            numeric = [(v, w) for v, w in zip(values, weights) if isinstance(v, (int, float))]
+            total = sum(w for _, w in numeric)
+            return sum(v * w for v, w in numeric) / total if total else first
+
+        if isinstance(first, str):
+            if first in self.SENTIMENT_LABELS:
+                votes: Counter = Counter()
+                for v, w in zip(values, weights):
+                    votes[v] += w
+                return votes.most_common(1)[0][0]
+            return "\n".join(dict.fromkeys(v for v in values if isinstance(v, str) and v))
+
+        return first
+
+    @staticmethod
+    def _merge_lists(values: List[Any]) -> List[Any]:
+        """Concatenate lists, deduplicating strings and combining named entities."""
+        merged: List[Any] = []
+        seen: set = set()
+        named: Dict[str, Dict[str, Any]] = {}
+        mentions: Counter = Counter()
+
+        for value in values:
+            if not isinstance(value, list):
+                continue
+            for entry in value:
+                if isinstance(entry, str):
+                    if entry not in seen:
+                        seen.add(entry)
+                        merged.append(entry)
+                elif isinstance(entry, dict) and entry.get("name"):
+                    name = entry["name"]
+                    if isinstance(entry.get("mentions"), int):
+                        mentions[name] += entry["mentions"]
+                    if name not in named:
+                        named[name] = dict(entry)
+                        merged.append(named[name])
+                else:
+                    merged.append(entry)
+
+        for name, count in mentions.items():
+            named[name]["mentions"] = count
+        return merged
+
+    def _prepare_data_for_analysis(
+        self, data: List[Dict[str, Any]], first_id: int = 1
+    ) -> str:
         """Prepare data as text for LLM analysis."""
-        texts = []
-        for i, item in enumerate(data[:20], 1):  # Limit to 20 items
-            platform = item.get("platform", "unknown")
-            title = item.get("title", "无标题")
-            summary = item.get("summary", "")
-            author = item.get("author", "未知")
-
-            texts.append(
-                f"[{i}] 平台: {platform}\n"
-                f"    标题: {title}\n"
-                f"    作者: {author}\n"
-                f"    摘要: {summary}\n"
+        buf = StringIO()
+        write = buf.write
+        for i, item in enumerate(islice(data, self.max_items), first_id):
+            get = item.get
+            if i != first_id:
+                write("\n")
+            write(
+                f"[{i}] 平台: {get('platform', 'unknown')}\n"
+                f"    标题: {get('title', '无标题')}\n"
+                f"    作者: {get('author', '未知')}\n"
+                f"    摘要: {get('summary', '')}\n"
             )
 
-        return "\n".join(texts)
+        return buf.getvalue()
 
     def _build_analysis_prompt(self, data_text: str, analysis_type: str) -> str:
-        """Build analysis prompt based on type."""
-        base = f"请分析以下收集到的信息：\n\n{data_text}\n\n"
-
-        if analysis_type == "sentiment":
-            return base + """请分析每条信息的情感倾向，并返回 JSON 格式：
-{
-    "overall_sentiment": "positive/negative/neutral",
-    "sentiment_score": 0.0-1.0,
-    "items": [{"id": 1, "sentiment": "positive/negative/neutral", "confidence": 0.0-1.0}]
-}"""
-
-        elif analysis_type == "summary":
-            return base + """请总结这些信息的核心内容，返回 JSON 格式：
-{
-    "main_points": ["要点1", "要点2", ...],
-    "key_entities": ["实体1", "实体2", ...],
-    "timeline": "时间线描述",
-    "brief_summary": "100字以内的简短总结"
-}"""
-
-        elif analysis_type == "extract_entities":
-            return base + """请提取所有提到的实体（公司、产品、人物），返回 JSON 格式：
-{
-    "companies": [{"name": "公司名", "mentions": 次数, "context": "相关上下文"}],
-    "products": [{"name": "产品名", "company": "所属公司", "mentions": 次数}],
-    "persons": [{"name": "人名", "role": "角色", "mentions": 次数}]
-}"""
-
-        else:  # full
-            return base + """请进行全面分析，返回 JSON 格式：
-{
-    "summary": "综合摘要",
-    "main_points": ["要点列表"],
-    "sentiment": {"overall": "positive/negative/neutral", "score": 0.0-1.0},
-    "entities": {"companies": [], "products": [], "persons": []},
-    "credibility_assessment": {"high": [], "medium": [], "low": []},
-    "contradictions": ["发现的矛盾信息"],
-    "recommendations": ["建议的后续行动"]
-}"""
+        """Build the dynamic part of the analysis prompt (the schema is cached separately)."""
+        return _PROMPT_PREFIX + data_text
 
     def _parse_analysis_result(self, text: str, analysis_type: str) -> Dict[str, Any]:
         """Parse LLM analysis result."""
-        import json
-
-        # Try to extract JSON from response
+        # Try to extract JSON from response: fenced block first, then the
+        # outermost object/array, then the whole text
         text = text.strip()
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            text = text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            text = text[start:end].strip()
+        match = _JSON_FENCE_RE.search(text) or _JSON_OBJ_RE.search(text)
+        payload = match.group(match.lastindex or 0) if match else text
 
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
             # Return text as-is if JSON parsing fails
             return {
-                "raw_analysis": text,
+                "raw_analysis": payload,
                 "parsing_failed": True,
             }
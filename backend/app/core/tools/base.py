@@ -5,12 +5,13 @@ Defines the base class and interfaces for Agent tools.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
 
-
-class ToolParameter(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ToolParameter:
     """Definition of a tool parameter."""
 
     name: str
@@ -21,15 +22,21 @@ class ToolParameter(BaseModel):
     default: Optional[Any] = None
 
 
-class ToolDefinition(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ToolDefinition:
     """Definition of a tool for LLM function calling."""
 
     name: str
     description: str
-    parameters: List[ToolParameter] = Field(default_factory=list)
+    parameters: List[ToolParameter] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return asdict(self)
 
 
-class ToolResult(BaseModel):
+@dataclass(slots=True)
+class ToolResult:
     """Result of a tool execution."""
 
     success: bool
@@ -48,6 +55,45 @@ class ToolResult(BaseModel):
         """Create a failed result."""
         return cls(success=False, error=error, duration_ms=duration_ms)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return asdict(self)
+
+
+# Parameter type -> (accepted Python types, description for error messages)
+_TYPE_MAP: Dict[str, Tuple[Union[type, Tuple[type, ...]], str]] = {
+    "string": (str, "a string"),
+    "integer": (int, "an integer"),
+    "number": ((int, float), "a number"),
+    "boolean": (bool, "a boolean"),
+    "array": (list, "an array"),
+    "object": (dict, "an object"),
+}
+
+
+class _SlotCached:
+    """
+    ``functools.cached_property`` for slotted classes.
+
+    Stores the computed value in the slot ``_<name>_cache``, which the
+    owning class must declare in ``__slots__``.
+    """
+
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.slot = f"_{func.__name__.lstrip('_')}_cache"
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            value = self.func(obj)
+            setattr(obj, self.slot, value)
+            return value
+
 
 class BaseTool(ABC):
     """
@@ -55,8 +101,18 @@ class BaseTool(ABC):
 
     Tools are the "hands" of the Agent - they perform actual work
     like searching, scraping, analyzing, etc.
+
+    Tools are slotted: subclasses must declare their own ``__slots__``.
     """
 
+    __slots__ = (
+        "_params_cache",
+        "_definition_cache",
+        "_function_schema_cache",
+        "_required_names_cache",
+        "_enum_sets_cache",
+    )
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -69,18 +125,26 @@ class BaseTool(ABC):
         """Tool description for LLM."""
         pass
 
+    # Static parameter definitions, built once at class definition
+    _PARAMETERS: Tuple[ToolParameter, ...] = ()
+
     @property
     def parameters(self) -> List[ToolParameter]:
-        """Tool parameters. Override to define parameters."""
-        return []
+        """Tool parameters. Set ``_PARAMETERS`` (or override) to define parameters."""
+        return list(self._PARAMETERS)
 
-    @property
+    @_SlotCached
+    def _params(self) -> Tuple[ToolParameter, ...]:
+        """Parameters built once per instance (``parameters`` is static per tool)."""
+        return tuple(self.parameters)
+
+    @_SlotCached
     def definition(self) -> ToolDefinition:
         """Get the complete tool definition."""
         return ToolDefinition(
             name=self.name,
             description=self.description,
-            parameters=self.parameters,
+            parameters=list(self._params),
         )
 
     @abstractmethod
@@ -96,12 +160,13 @@ class BaseTool(ABC):
         """
         pass
 
-    def to_function_schema(self) -> Dict[str, Any]:
-        """Convert to Gemini Function Calling format."""
+    @_SlotCached
+    def function_schema(self) -> Mapping[str, Any]:
+        """Gemini Function Calling schema, built once per instance (read-only)."""
         properties = {}
         required = []
 
-        for param in self.parameters:
+        for param in self._params:
             prop = {
                 "type": param.type,
                 "description": param.description,
@@ -113,7 +178,7 @@ class BaseTool(ABC):
             if param.required:
                 required.append(param.name)
 
-        return {
+        return MappingProxyType({
             "name": self.name,
             "description": self.description,
             "parameters": {
@@ -121,7 +186,19 @@ class BaseTool(ABC):
                 "properties": properties,
                 "required": required,
             },
-        }
+        })
+
+    def to_function_schema(self) -> Dict[str, Any]:
+        """Convert to Gemini Function Calling format."""
+        return dict(self.function_schema)
+
+    @_SlotCached
+    def _required_names(self) -> FrozenSet[str]:
+        return frozenset(p.name for p in self._params if p.required)
+
+    @_SlotCached
+    def _enum_sets(self) -> Dict[str, FrozenSet[Any]]:
+        return {p.name: frozenset(p.enum) for p in self._params if p.enum}
 
     def validate_params(self, **kwargs) -> Optional[str]:
         """
@@ -129,21 +206,23 @@ class BaseTool(ABC):
 
         Returns None if valid, error message if invalid.
         """
-        for param in self.parameters:
-            if param.required and param.name not in kwargs:
-                return f"Missing required parameter: {param.name}"
-
-            if param.name in kwargs:
-                value = kwargs[param.name]
-                # Basic type checking
-                if param.type == "string" and not isinstance(value, str):
-                    return f"Parameter {param.name} must be a string"
-                elif param.type == "integer" and not isinstance(value, int):
-                    return f"Parameter {param.name} must be an integer"
-                elif param.type == "array" and not isinstance(value, list):
-                    return f"Parameter {param.name} must be an array"
-                elif param.enum and value not in param.enum:
-                    return f"Parameter {param.name} must be one of: {param.enum}"
+        if missing := self._required_names - kwargs.keys():
+            name = next(p.name for p in self._params if p.name in missing)
+            return f"Missing required parameter: {name}"
+
+        for param in self._params:
+            if param.name not in kwargs:
+                continue
+            value = kwargs[param.name]
+
+            # Basic type checking
+            expected = _TYPE_MAP.get(param.type)
+            if expected and not isinstance(value, expected[0]):
+                return f"Parameter {param.name} must be {expected[1]}"
+
+            enum_set = self._enum_sets.get(param.name)
+            if enum_set is not None and value not in enum_set:
+                return f"Parameter {param.name} must be one of: {param.enum}"
 
         return None
 
@@ -4,14 +4,124 @@ Memory Search Tool
 Searches the intelligence memory database using semantic search.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from app.core.tools.base import BaseTool, ToolParameter, ToolResult
 from app.memory import MemoryManager, get_memory_manager
 
+__all__ = ["MemorySearchTool", "MemoryStoreTool"]
+
 logger = logging.getLogger(__name__)
 
+# Memories mentioning either keyword are treated as timeline changes
+_CHANGE_KEYWORDS_RE = re.compile(r"change|update", re.IGNORECASE)
+
+
+class MemoryRecord(NamedTuple):
+    """A memory search hit (converted to a dict at the ToolResult boundary)."""
+
+    id: str
+    content: str
+    memory_type: str
+    relevance_score: float
+    similarity_score: float
+    importance_score: float
+    created_at: str
+    metadata: Dict[str, Any]
+    summary: Optional[str] = None
+
+
+class TimelineChange(NamedTuple):
+    """A detected timeline change for a subject."""
+
+    change_type: str
+    description: str
+    detected_at: str
+    confidence: float
+
+
+# Mock data; ``content``/``description`` are templates filled per query.
+# The metadata dicts are shared between results and must not be mutated.
+_MOCK_MEMORIES: Tuple[MemoryRecord, ...] = (
+    MemoryRecord(
+        id="mem_001",
+        content="历史记录：关于 {query} 的早期报道显示市场反应积极",
+        memory_type="fact",
+        relevance_score=0.92,
+        similarity_score=0.88,
+        importance_score=0.75,
+        created_at="2025-12-15T10:30:00",
+        metadata={"platform": "zhihu"},
+    ),
+    MemoryRecord(
+        id="mem_002",
+        content="历史记录：{query} 在上个月的讨论热度有所下降",
+        memory_type="insight",
+        relevance_score=0.88,
+        similarity_score=0.82,
+        importance_score=0.68,
+        created_at="2026-01-20T14:15:00",
+        metadata={"platform": "wechat"},
+    ),
+    MemoryRecord(
+        id="mem_003",
+        content="历史记录：行业专家对 {query} 的前景表示乐观",
+        memory_type="fact",
+        relevance_score=0.85,
+        similarity_score=0.80,
+        importance_score=0.82,
+        created_at="2026-01-28T09:00:00",
+        metadata={"platform": "zhihu", "author": "AI行业分析师"},
+    ),
+)
+
+_MOCK_SUBJECT_MEMORY = MemoryRecord(
+    id="mem_004",
+    content="历史记录：{subject} 曾在2个月前下线某功能，现已恢复",
+    memory_type="pattern",
+    relevance_score=0.95,
+    similarity_score=0.90,
+    importance_score=0.88,
+    created_at="2025-12-01T16:45:00",
+    metadata={"platform": "wechat", "change_type": "feature_restored"},
+)
+
+_MOCK_CHANGES: Tuple[TimelineChange, ...] = (
+    TimelineChange(
+        change_type="feature_removed",
+        description="{subject} 聊天功能下线",
+        detected_at="2025-11-15T12:00:00",
+        confidence=0.9,
+    ),
+    TimelineChange(
+        change_type="feature_restored",
+        description="{subject} 聊天功能重新上线（改进版）",
+        detected_at="2026-01-20T10:00:00",
+        confidence=0.85,
+    ),
+    TimelineChange(
+        change_type="pricing_change",
+        description="{subject} API 价格下调 50%",
+        detected_at="2026-02-01T08:00:00",
+        confidence=0.95,
+    ),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_shared_memory_manager() -> MemoryManager:
+    """Get the process-wide memory manager, resolved once for all memory tools."""
+    return get_memory_manager()
+
+
+async def _noop() -> List[Any]:
+    """Placeholder for a skipped lookup in asyncio.gather."""
+    return []
+
 
 class MemorySearchTool(BaseTool):
     """
@@ -21,6 +131,8 @@ class MemorySearchTool(BaseTool):
     using semantic similarity. Can detect temporal changes and patterns.
     """
 
+    __slots__ = ("use_mock",)
+
     def __init__(self, use_mock: bool = False):
         """
         Initialize memory search tool.
@@ -30,13 +142,6 @@ class MemorySearchTool(BaseTool):
         """
         super().__init__()
         self.use_mock = use_mock
-        self._memory_manager: Optional[MemoryManager] = None
-
-    def _get_memory_manager(self) -> MemoryManager:
-        """Lazily get memory manager."""
-        if self._memory_manager is None:
-            self._memory_manager = get_memory_manager()
-        return self._memory_manager
 
     @property
     def name(self) -> str:
@@ -46,40 +151,38 @@ class MemorySearchTool(BaseTool):
     def description(self) -> str:
         return "在历史情报库中进行语义搜索，找出相关的历史信息。可以发现跨时间的变化。"
 
-    @property
-    def parameters(self) -> List[ToolParameter]:
-        return [
-            ToolParameter(
-                name="query",
-                type="string",
-                description="搜索查询",
-            ),
-            ToolParameter(
-                name="subject",
-                type="string",
-                description="关注的主体（公司/产品名）",
-                required=False,
-            ),
-            ToolParameter(
-                name="memory_type",
-                type="string",
-                description="记忆类型过滤: fact, insight, pattern, summary, entity",
-                required=False,
-                enum=["fact", "insight", "pattern", "summary", "entity"],
-            ),
-            ToolParameter(
-                name="detect_changes",
-                type="boolean",
-                description="是否检测时间线变化（如功能上下线）",
-                required=False,
-            ),
-            ToolParameter(
-                name="limit",
-                type="integer",
-                description="返回的最大结果数",
-                required=False,
-            ),
-        ]
+    _PARAMETERS = (
+        ToolParameter(
+            name="query",
+            type="string",
+            description="搜索查询",
+        ),
+        ToolParameter(
+            name="subject",
+            type="string",
+            description="关注的主体（公司/产品名）",
+            required=False,
+        ),
+        ToolParameter(
+            name="memory_type",
+            type="string",
+            description="记忆类型过滤: fact, insight, pattern, summary, entity",
+            required=False,
+            enum=["fact", "insight", "pattern", "summary", "entity"],
+        ),
+        ToolParameter(
+            name="detect_changes",
+            type="boolean",
+            description="是否检测时间线变化（如功能上下线）",
+            required=False,
+        ),
+        ToolParameter(
+            name="limit",
+            type="integer",
+            description="返回的最大结果数",
+            required=False,
+        ),
+    )
 
     async def execute(
         self,
@@ -107,56 +210,59 @@ class MemorySearchTool(BaseTool):
         limit: int,
     ) -> ToolResult:
         """Execute real memory search."""
-        memory_manager = self._get_memory_manager()
+        memory_manager = _get_shared_memory_manager()
 
         try:
-            # Perform semantic search
-            search_results = await memory_manager.recall(
-                query=query,
-                limit=limit,
-                memory_type=memory_type,
-                entity=subject,
-                min_relevance=0.3,
+            # Semantic search, change detection and the entity lookup are
+            # independent, so run them concurrently (MemoryManager must be
+            # safe to call from concurrent coroutines)
+            search_results, changes, entity_memories = await asyncio.gather(
+                memory_manager.recall(
+                    query=query,
+                    limit=limit,
+                    memory_type=memory_type,
+                    entity=subject,
+                    min_relevance=0.3,
+                ),
+                self._detect_changes(subject, memory_manager)
+                if detect_changes and subject
+                else _noop(),
+                memory_manager.get_by_entity(subject, limit=5) if subject else _noop(),
             )
 
             # Format results
-            results = []
-            for sr in search_results:
-                memory = sr.memory
-                results.append({
-                    "id": memory.id,
-                    "content": memory.content,
-                    "summary": memory.summary,
-                    "memory_type": memory.memory_type,
-                    "relevance_score": round(sr.relevance_score, 3),
-                    "similarity_score": round(sr.similarity_score, 3),
-                    "importance_score": round(memory.importance_score, 3),
-                    "created_at": memory.created_at.isoformat(),
-                    "metadata": memory.metadata,
-                })
-
-            # Detect changes if requested
-            changes = []
-            if detect_changes and subject:
-                changes = await self._detect_changes(subject, memory_manager)
-
-            # Get related entities if subject specified
-            related_memories = []
-            if subject:
-                entity_memories = await memory_manager.get_by_entity(subject, limit=5)
-                for m in entity_memories:
-                    if m.id not in [r["id"] for r in results]:
-                        related_memories.append({
-                            "id": m.id,
-                            "content": m.content[:200],
-                            "memory_type": m.memory_type,
-                        })
+            results = [
+                MemoryRecord(
+                    id=sr.memory.id,
+                    content=sr.memory.content,
+                    memory_type=sr.memory.memory_type,
+                    relevance_score=round(sr.relevance_score, 3),
+                    similarity_score=round(sr.similarity_score, 3),
+                    importance_score=round(sr.memory.importance_score, 3),
+                    created_at=sr.memory.created_at.isoformat(),
+                    metadata=sr.memory.metadata,
+                    summary=sr.memory.summary,
+                )
+                for sr in search_results
+            ]
+
+            # Related memories by entity that the search didn't already return
+            existing_ids = {r.id for r in results}
+            related_memories = [
+                {
+                    "id": m.id,
+                    "content": m.content[:200],
+                    "memory_type": m.memory_type,
+                }
+                for m in entity_memories
+                if m.id not in existing_ids
+            ]
 
             return ToolResult.ok(
                 data={
-                    "results": results,
+                    "results": [r._asdict() for r in results],
                     "total": len(results),
-                    "timeline_changes": changes if detect_changes else None,
+                    "timeline_changes": [c._asdict() for c in changes] if detect_changes else None,
                     "related_by_entity": related_memories if subject else None,
                     "memory_stats": memory_manager.get_stats(),
                 }
@@ -171,7 +277,7 @@ class MemorySearchTool(BaseTool):
         self,
         subject: str,
         memory_manager: MemoryManager,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TimelineChange]:
         """Detect timeline changes for a subject."""
         changes = []
 
@@ -186,13 +292,13 @@ class MemorySearchTool(BaseTool):
 
         for sr in pattern_results:
             memory = sr.memory
-            if "change" in memory.content.lower() or "update" in memory.content.lower():
-                changes.append({
-                    "change_type": memory.metadata.get("change_type", "unknown"),
-                    "description": memory.content,
-                    "detected_at": memory.created_at.isoformat(),
-                    "confidence": memory.metadata.get("confidence", 0.5),
-                })
+            if _CHANGE_KEYWORDS_RE.search(memory.content):
+                changes.append(TimelineChange(
+                    change_type=memory.metadata.get("change_type", "unknown"),
+                    description=memory.content,
+                    detected_at=memory.created_at.isoformat(),
+                    confidence=memory.metadata.get("confidence", 0.5),
+                ))
 
         return changes
 
@@ -210,84 +316,30 @@ class MemorySearchTool(BaseTool):
 
         return ToolResult.ok(
             data={
-                "results": results,
+                "results": [r._asdict() for r in results],
                 "total": len(results),
-                "timeline_changes": changes if detect_changes else None,
+                "timeline_changes": [c._asdict() for c in changes] if detect_changes else None,
             }
         )
 
     def _generate_mock_memory_results(
         self, query: str, subject: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[MemoryRecord]:
         """Generate mock memory search results."""
-        mock_results = [
-            {
-                "id": "mem_001",
-                "content": f"历史记录：关于 {query} 的早期报道显示市场反应积极",
-                "memory_type": "fact",
-                "relevance_score": 0.92,
-                "similarity_score": 0.88,
-                "importance_score": 0.75,
-                "created_at": "2025-12-15T10:30:00",
-                "metadata": {"platform": "zhihu"},
-            },
-            {
-                "id": "mem_002",
-                "content": f"历史记录：{query} 在上个月的讨论热度有所下降",
-                "memory_type": "insight",
-                "relevance_score": 0.88,
-                "similarity_score": 0.82,
-                "importance_score": 0.68,
-                "created_at": "2026-01-20T14:15:00",
-                "metadata": {"platform": "wechat"},
-            },
-            {
-                "id": "mem_003",
-                "content": f"历史记录：行业专家对 {query} 的前景表示乐观",
-                "memory_type": "fact",
-                "relevance_score": 0.85,
-                "similarity_score": 0.80,
-                "importance_score": 0.82,
-                "created_at": "2026-01-28T09:00:00",
-                "metadata": {"platform": "zhihu", "author": "AI行业分析师"},
-            },
-        ]
-
+        results = [r._replace(content=r.content.format(query=query)) for r in _MOCK_MEMORIES]
         if subject:
-            mock_results.append({
-                "id": "mem_004",
-                "content": f"历史记录：{subject} 曾在2个月前下线某功能，现已恢复",
-                "memory_type": "pattern",
-                "relevance_score": 0.95,
-                "similarity_score": 0.90,
-                "importance_score": 0.88,
-                "created_at": "2025-12-01T16:45:00",
-                "metadata": {"platform": "wechat", "change_type": "feature_restored"},
-            })
-
-        return mock_results
-
-    def _detect_mock_changes(self, subject: str) -> List[Dict[str, Any]]:
+            results.append(
+                _MOCK_SUBJECT_MEMORY._replace(
+                    content=_MOCK_SUBJECT_MEMORY.content.format(subject=subject)
+                )
+            )
+        return results
+
+    def _detect_mock_changes(self, subject: str) -> List[TimelineChange]:
         """Detect mock timeline changes."""
         return [
-            {
-                "change_type": "feature_removed",
-                "description": f"{subject} 聊天功能下线",
-                "detected_at": "2025-11-15T12:00:00",
-                "confidence": 0.9,
-            },
-            {
-                "change_type": "feature_restored",
-                "description": f"{subject} 聊天功能重新上线（改进版）",
-                "detected_at": "2026-01-20T10:00:00",
-                "confidence": 0.85,
-            },
-            {
-                "change_type": "pricing_change",
-                "description": f"{subject} API 价格下调 50%",
-                "detected_at": "2026-02-01T08:00:00",
-                "confidence": 0.95,
-            },
+            c._replace(description=c.description.format(subject=subject))
+            for c in _MOCK_CHANGES
         ]
 
 
@@ -298,15 +350,11 @@ class MemoryStoreTool(BaseTool):
     Used by the Agent to persist important insights and facts.
     """
 
+    __slots__ = ("use_mock",)
+
     def __init__(self, use_mock: bool = False):
         super().__init__()
         self.use_mock = use_mock
-        self._memory_manager: Optional[MemoryManager] = None
-
-    def _get_memory_manager(self) -> MemoryManager:
-        if self._memory_manager is None:
-            self._memory_manager = get_memory_manager()
-        return self._memory_manager
 
     @property
     def name(self) -> str:
@@ -316,39 +364,37 @@ class MemoryStoreTool(BaseTool):
     def description(self) -> str:
         return "将重要的洞察、事实或模式存储到长期记忆中，以便未来任务时回忆。"
 
-    @property
-    def parameters(self) -> List[ToolParameter]:
-        return [
-            ToolParameter(
-                name="content",
-                type="string",
-                description="要存储的内容",
-            ),
-            ToolParameter(
-                name="memory_type",
-                type="string",
-                description="记忆类型: fact, insight, pattern",
-                enum=["fact", "insight", "pattern"],
-            ),
-            ToolParameter(
-                name="importance",
-                type="number",
-                description="重要性评分 (0-1)",
-                required=False,
-            ),
-            ToolParameter(
-                name="entities",
-                type="array",
-                description="相关实体（公司、产品名等）",
-                required=False,
-            ),
-            ToolParameter(
-                name="summary",
-                type="string",
-                description="内容摘要",
-                required=False,
-            ),
-        ]
+    _PARAMETERS = (
+        ToolParameter(
+            name="content",
+            type="string",
+            description="要存储的内容",
+        ),
+        ToolParameter(
+            name="memory_type",
+            type="string",
+            description="记忆类型: fact, insight, pattern",
+            enum=["fact", "insight", "pattern"],
+        ),
+        ToolParameter(
+            name="importance",
+            type="number",
+            description="重要性评分 (0-1)",
+            required=False,
+        ),
+        ToolParameter(
+            name="entities",
+            type="array",
+            description="相关实体（公司、产品名等）",
+            required=False,
+        ),
+        ToolParameter(
+            name="summary",
+            type="string",
+            description="内容摘要",
+            required=False,
+        ),
+    )
 
     async def execute(
         self,
@@ -370,7 +416,7 @@ class MemoryStoreTool(BaseTool):
             )
 
         try:
-            memory_manager = self._get_memory_manager()
+            memory_manager = _get_shared_memory_manager()
             memory_id = await memory_manager.store(
                 content=content,
                 memory_type=memory_type,
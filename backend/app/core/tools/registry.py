@@ -4,7 +4,11 @@ Tool Registry
 Central registry for all available tools.
 """
 
-from typing import Dict, List, Optional, TYPE_CHECKING
+import importlib
+import threading
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import orjson
 
 from app.core.tools.base import BaseTool, ToolDefinition
 
@@ -22,42 +26,71 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        # Built on first use; tools are immutable once registered
+        self._tools_cache: Optional[Tuple[BaseTool, ...]] = None
+        self._names_cache: Optional[Tuple[str, ...]] = None
+        self._definitions_cache: Optional[List[ToolDefinition]] = None
+        self._schemas_cache: Optional[List[Dict]] = None
+        self._schemas_json_cache: Optional[bytes] = None
+
+    def _invalidate(self) -> None:
+        self._tools_cache = None
+        self._names_cache = None
+        self._definitions_cache = None
+        self._schemas_cache = None
+        self._schemas_json_cache = None
 
     def register(self, tool: BaseTool) -> None:
         """Register a tool."""
         if tool.name in self._tools:
             raise ValueError(f"Tool '{tool.name}' is already registered")
         self._tools[tool.name] = tool
+        self._invalidate()
 
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         if name in self._tools:
             del self._tools[name]
+            self._invalidate()
 
     def get(self, name: str) -> Optional[BaseTool]:
         """Get a tool by name."""
         return self._tools.get(name)
 
-    def get_all(self) -> List[BaseTool]:
-        """Get all registered tools."""
-        return list(self._tools.values())
+    def get_all(self) -> Tuple[BaseTool, ...]:
+        """Get all registered tools (in registration order)."""
+        if self._tools_cache is None:
+            self._tools_cache = tuple(self._tools.values())
+        return self._tools_cache
 
-    def get_names(self) -> List[str]:
+    def get_names(self) -> Tuple[str, ...]:
         """Get all tool names."""
-        return list(self._tools.keys())
+        if self._names_cache is None:
+            self._names_cache = tuple(self._tools)
+        return self._names_cache
 
     def get_definitions(self) -> List[ToolDefinition]:
         """Get definitions of all tools."""
-        return [tool.definition for tool in self._tools.values()]
+        if self._definitions_cache is None:
+            self._definitions_cache = [tool.definition for tool in self.get_all()]
+        return list(self._definitions_cache)
 
     def get_function_schemas(self) -> List[Dict]:
-        """Get all tools as function schemas for LLM."""
-        return [tool.to_function_schema() for tool in self._tools.values()]
+        """Get all tools as function schemas for LLM (shared; do not mutate)."""
+        if self._schemas_cache is None:
+            self._schemas_cache = [tool.to_function_schema() for tool in self.get_all()]
+        return list(self._schemas_cache)
+
+    def get_function_schemas_json(self) -> bytes:
+        """Get all function schemas serialized once as JSON bytes (for wire transport)."""
+        if self._schemas_json_cache is None:
+            self._schemas_json_cache = orjson.dumps(self.get_function_schemas())
+        return self._schemas_json_cache
 
     def get_tools_by_type(self, tool_type: str) -> List[BaseTool]:
         """Get tools filtered by type (based on name prefix)."""
         return [
-            tool for tool in self._tools.values()
+            tool for tool in self.get_all()
             if tool.name.startswith(tool_type)
         ]
 
@@ -72,6 +105,7 @@ class ToolRegistry:
         Returns:
             ToolRegistry with all default tools registered
         """
+        # Imported here to avoid circular imports (preload_tools() warms them)
         from app.core.tools.search_tool import PlatformSearchTool
         from app.core.tools.analyze_tool import AnalyzeTool
         from app.core.tools.memory_tool import MemorySearchTool
@@ -88,16 +122,38 @@ class ToolRegistry:
         return registry
 
 
+# Modules of the default tools, imported by preload_tools()
+_DEFAULT_TOOL_MODULES = (
+    "app.core.tools.search_tool",
+    "app.core.tools.analyze_tool",
+    "app.core.tools.memory_tool",
+    "app.core.tools.synthesize_tool",
+)
+
 # Global registry instance
 _registry: Optional[ToolRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def preload_tools() -> None:
+    """
+    Import the default tool modules (and their crawler/HTTP dependencies).
+
+    Call on application startup so the first agent request doesn't pay
+    the import cost in create_default().
+    """
+    for module in _DEFAULT_TOOL_MODULES:
+        importlib.import_module(module)
 
 
 def get_tool_registry(llm_router: Optional["LLMRouter"] = None) -> ToolRegistry:
     """Get or create the global tool registry."""
     global _registry
     if _registry is None:
-        if llm_router is None:
-            from app.core.llm.router import get_llm_router
-            llm_router = get_llm_router()
-        _registry = ToolRegistry.create_default(llm_router)
+        with _registry_lock:
+            if _registry is None:
+                if llm_router is None:
+                    from app.core.llm.router import get_llm_router
+                    llm_router = get_llm_router()
+                _registry = ToolRegistry.create_default(llm_router)
     return _registry
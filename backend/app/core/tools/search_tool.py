@@ -5,9 +5,12 @@ Searches content across GCR platforms (WeChat, Zhihu, Xiaohongshu, Douyin).
 """
 
 import asyncio
+import functools
 import logging
-from typing import Any, Callable, Dict, List, Optional
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from app.core.llm.cache import InMemoryLRU
 from app.core.tools.base import BaseTool, ToolParameter, ToolResult
 from app.crawlers.base import BaseCrawler, CrawlResult
 from app.crawlers.anti_detect import (
@@ -18,6 +21,92 @@ from app.crawlers.anti_detect import (
 
 logger = logging.getLogger(__name__)
 
+# Known entities in result titles -> discovered keyword, matched in one pass
+_KNOWN_ENTITIES: Dict[str, str] = {
+    "DeepSeek": "DeepSeek R1",
+    "API": "API pricing",
+    "Kimi": "Moonshot Kimi",
+}
+_KNOWN_ENTITIES_RE = re.compile("|".join(map(re.escape, _KNOWN_ENTITIES)))
+
+# Mock result templates per platform: (fields, metrics). Fields are formatted
+# with query, i (0-based) and n (1-based); each metric is (name, start, step)
+# and decreases by step per result.
+_MOCK_TEMPLATES: Dict[str, Tuple[Dict[str, str], Tuple[Tuple[str, int, int], ...]]] = {
+    "zhihu": (
+        {
+            "id": "zhihu_{i}",
+            "platform": "zhihu",
+            "title": "{query} 技术深度分析 - 第{n}篇",
+            "summary": "这是一篇关于 {query} 的专业技术分析文章，探讨了其核心架构和实现原理...",
+            "author": "技术专家{n}",
+            "url": "https://zhihu.com/answer/1{i:05d}",
+            "published_at": "2026-02-01",
+        },
+        (("voteup", 1500, 100), ("comments", 200, 20)),
+    ),
+    "wechat": (
+        {
+            "id": "wechat_{i}",
+            "platform": "wechat",
+            "title": "{query} 行业报告 - 第{n}期",
+            "summary": "本文深入分析了 {query} 在行业中的应用前景和商业模式...",
+            "author": "AI前沿公众号{n}",
+            "url": "https://mp.weixin.qq.com/s/mock_4{i:05d}",
+            "published_at": "2026-02-03",
+        },
+        (("reads", 10000, 1000), ("likes", 500, 50)),
+    ),
+    "xiaohongshu": (
+        {
+            "id": "xhs_{i}",
+            "platform": "xiaohongshu",
+            "title": "实测 {query}！真的太好用了",
+            "summary": "今天给大家测评一下 {query}，体验感受和详细教程...",
+            "author": "科技博主{n}",
+            "url": "https://xiaohongshu.com/note/2{i:05d}",
+            "published_at": "2026-02-05",
+        },
+        (("likes", 5000, 500), ("collects", 1000, 100)),
+    ),
+    "douyin": (
+        {
+            "id": "douyin_{i}",
+            "platform": "douyin",
+            "title": "一分钟带你了解 {query}",
+            "summary": "简单易懂的 {query} 科普视频...",
+            "author": "科技达人{n}",
+            "url": "https://douyin.com/video/3{i:05d}",
+            "published_at": "2026-02-04",
+        },
+        (("plays", 100000, 10000), ("likes", 8000, 800)),
+    ),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _mock_results(query: str, platform: str, count: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    Build mock results from the templates (memoized per query/platform/count).
+
+    Used as the fallback for failed crawlers, so repeated failures reuse the
+    same rows. Rows carry ``is_mock: True`` so they can't be mistaken for
+    real results. The dicts are shared between calls and must not be mutated.
+    """
+    template = _MOCK_TEMPLATES.get(platform)
+    if template is None:
+        return ()
+
+    fields, metrics = template
+    return tuple(
+        {
+            **{key: value.format(query=query, i=i, n=i + 1) for key, value in fields.items()},
+            "metrics": {name: start - i * step for name, start, step in metrics},
+            "is_mock": True,
+        }
+        for i in range(count)
+    )
+
 
 class PlatformSearchTool(BaseTool):
     """
@@ -27,6 +116,15 @@ class PlatformSearchTool(BaseTool):
     Supports both real crawler mode and mock mode for testing.
     """
 
+    __slots__ = (
+        "use_mock",
+        "on_screenshot",
+        "_crawlers",
+        "_initialized",
+        "_result_cache",
+        "_crawl_semaphore",
+    )
+
     # Platform display names
     PLATFORM_NAMES = {
         "zhihu": "知乎",
@@ -35,6 +133,14 @@ class PlatformSearchTool(BaseTool):
         "douyin": "抖音",
     }
 
+    # Max crawler searches in flight across concurrent calls and batched queries,
+    # so fan-out doesn't exhaust proxies/connections and trigger rate limiting
+    MAX_CONCURRENT_CRAWLS = 8
+
+    # Successful crawler results are reused for repeat queries within a session
+    RESULT_CACHE_TTL_S = 300
+    RESULT_CACHE_SIZE = 256
+
     def __init__(self, use_mock: bool = False, on_screenshot: Optional[Callable[[str, str], None]] = None):
         """
         Initialize the search tool.
@@ -48,6 +154,8 @@ class PlatformSearchTool(BaseTool):
         self.on_screenshot = on_screenshot
         self._crawlers: Dict[str, BaseCrawler] = {}
         self._initialized = False
+        self._result_cache = InMemoryLRU(maxsize=self.RESULT_CACHE_SIZE)
+        self._crawl_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CRAWLS)
 
     def set_screenshot_callback(self, callback: Optional[Callable[[str, str], None]]) -> None:
         """
@@ -101,34 +209,38 @@ class PlatformSearchTool(BaseTool):
     def description(self) -> str:
         return "在中国主流社交媒体平台搜索相关内容。支持微信公众号、知乎、小红书、抖音。"
 
-    @property
-    def parameters(self) -> List[ToolParameter]:
-        return [
-            ToolParameter(
-                name="query",
-                type="string",
-                description="搜索关键词",
-            ),
-            ToolParameter(
-                name="platforms",
-                type="array",
-                description="要搜索的平台列表 (wechat, zhihu, xiaohongshu, douyin)",
-                required=False,
-            ),
-            ToolParameter(
-                name="time_range",
-                type="string",
-                description="时间范围: 1d, 7d, 30d, 90d",
-                required=False,
-                enum=["1d", "7d", "30d", "90d"],
-            ),
-            ToolParameter(
-                name="limit",
-                type="integer",
-                description="每个平台返回的最大结果数",
-                required=False,
-            ),
-        ]
+    _PARAMETERS = (
+        ToolParameter(
+            name="query",
+            type="string",
+            description="搜索关键词",
+        ),
+        ToolParameter(
+            name="platforms",
+            type="array",
+            description="要搜索的平台列表 (wechat, zhihu, xiaohongshu, douyin)",
+            required=False,
+        ),
+        ToolParameter(
+            name="time_range",
+            type="string",
+            description="时间范围: 1d, 7d, 30d, 90d",
+            required=False,
+            enum=["1d", "7d", "30d", "90d"],
+        ),
+        ToolParameter(
+            name="limit",
+            type="integer",
+            description="每个平台返回的最大结果数",
+            required=False,
+        ),
+        ToolParameter(
+            name="queries",
+            type="array",
+            description="额外的搜索关键词（与 query 一并搜索，结果合并去重）",
+            required=False,
+        ),
+    )
 
     async def execute(
         self,
@@ -136,15 +248,58 @@ class PlatformSearchTool(BaseTool):
         platforms: List[str] = None,
         time_range: str = "7d",
         limit: int = 10,
+        queries: Optional[List[str]] = None,
         **kwargs,
     ) -> ToolResult:
-        """Execute platform search."""
+        """
+        Execute platform search.
+
+        Extra ``queries`` (e.g. synonyms or refined keywords) are searched
+        concurrently with ``query`` and merged into one result.
+        """
         platforms = platforms or ["zhihu", "wechat", "xiaohongshu"]
+        search = self._execute_mock if self.use_mock else self._execute_real
 
-        if self.use_mock:
-            return await self._execute_mock(query, platforms, time_range, limit)
+        all_queries = list(dict.fromkeys([query, *(queries or ())]))
+        if len(all_queries) == 1:
+            return await search(query, platforms, time_range, limit)
 
-        return await self._execute_real(query, platforms, time_range, limit)
+        tool_results = await asyncio.gather(
+            *(search(q, platforms, time_range, limit) for q in all_queries)
+        )
+        return self._merge_search_results(all_queries, tool_results)
+
+    def _merge_search_results(
+        self, queries: List[str], tool_results: List[ToolResult]
+    ) -> ToolResult:
+        """Merge per-query search results, de-duplicating items by (platform, id)."""
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        platforms_searched: Dict[str, None] = {}
+        keywords: Dict[str, None] = {}
+        errors: List[str] = []
+
+        for tool_result in tool_results:
+            data = tool_result.data
+            for item in data["results"]:
+                key = (item.get("platform"), item.get("id"))
+                if key not in seen:
+                    seen.add(key)
+                    results.append(item)
+            platforms_searched.update(dict.fromkeys(data["platforms_searched"]))
+            keywords.update(dict.fromkeys(data["discovered_keywords"]))
+            errors.extend(data.get("errors") or ())
+
+        return ToolResult.ok(
+            data={
+                "results": results,
+                "total": len(results),
+                "queries": queries,
+                "platforms_searched": list(platforms_searched),
+                "discovered_keywords": list(keywords),
+                "errors": errors or None,
+            }
+        )
 
     async def _execute_real(
         self,
@@ -160,22 +315,27 @@ class PlatformSearchTool(BaseTool):
         errors = []
         searched_platforms = []
 
-        # Search each platform concurrently
-        tasks = []
-        platform_order = []
+        # Timeouts apply per HTTP request (BaseCrawler.REQUEST_TIMEOUT_S), so
+        # time queued on the semaphore or the rate limiter doesn't count
+        async def search(platform: str) -> Tuple[str, Union[CrawlResult, Exception]]:
+            try:
+                return platform, await self._search_platform(
+                    self._crawlers[platform], query, time_range, limit
+                )
+            except Exception as e:
+                return platform, e
+
+        # Start crawler searches first so they run while the others are handled
+        tasks = [
+            asyncio.create_task(search(platform))
+            for platform in platforms
+            if platform in self._crawlers
+        ]
 
         for platform in platforms:
             if platform in self._crawlers:
-                tasks.append(
-                    self._search_platform(
-                        self._crawlers[platform],
-                        query,
-                        time_range,
-                        limit,
-                    )
-                )
-                platform_order.append(platform)
-            elif platform == "xiaohongshu":
+                continue
+            if platform == "xiaohongshu":
                 # Use Playwright-based crawler for Xiaohongshu
                 xhs_results = await self._search_xiaohongshu(query, limit)
                 results.extend(xhs_results)
@@ -187,33 +347,33 @@ class PlatformSearchTool(BaseTool):
             else:
                 errors.append(f"Unknown platform: {platform}")
 
-        # Execute concurrent searches
-        if tasks:
-            crawl_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for platform, crawl_result in zip(platform_order, crawl_results):
-                if isinstance(crawl_result, Exception):
-                    errors.append(f"{platform}: {str(crawl_result)}")
-                    # Fall back to mock data on error
-                    results.extend(self._generate_mock_results(query, platform, limit))
-                elif crawl_result.error:
-                    errors.append(f"{platform}: {crawl_result.error}")
-                    results.extend(self._generate_mock_results(query, platform, limit))
-                else:
-                    # Convert CrawlItems to result dicts
-                    for item in crawl_result.items:
-                        results.append({
-                            "id": item.id,
-                            "platform": item.platform,
-                            "title": item.title,
-                            "summary": item.summary or item.content[:200] if item.content else "",
-                            "author": item.author_name,
-                            "url": item.url,
-                            "published_at": item.published_at,
-                            "metrics": item.metrics,
-                        })
+        # Process each crawler's results as soon as it finishes
+        for next_done in asyncio.as_completed(tasks):
+            platform, crawl_result = await next_done
+            if isinstance(crawl_result, Exception):
+                errors.append(f"{platform}: {str(crawl_result)}")
+                # Fall back to mock data on error
+                results.extend(self._generate_mock_results(query, platform, limit))
+            elif crawl_result.error:
+                errors.append(f"{platform}: {crawl_result.error}")
+                results.extend(self._generate_mock_results(query, platform, limit))
+            else:
+                # Convert CrawlItems to result dicts
+                results.extend(
+                    {
+                        "id": item.id,
+                        "platform": item.platform,
+                        "title": item.title,
+                        "summary": item.summary or item.content[:200] if item.content else "",
+                        "author": item.author_name,
+                        "url": item.url,
+                        "published_at": item.published_at,
+                        "metrics": item.metrics,
+                    }
+                    for item in crawl_result.items
+                )
 
-                searched_platforms.append(platform)
+            searched_platforms.append(platform)
 
         # Extract keywords for expansion
         discovered_keywords = self._extract_keywords_from_results(results)
@@ -235,13 +395,24 @@ class PlatformSearchTool(BaseTool):
         time_range: str,
         limit: int,
     ) -> CrawlResult:
-        """Search a single platform."""
+        """Search a single platform (successful results are cached briefly)."""
+        cache_key = f"{crawler.platform_name}\0{query.strip().lower()}\0{time_range}\0{limit}"
+        cached = await self._result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            return await crawler.search(query, time_range, limit)
+            async with self._crawl_semaphore:
+                result = await crawler.search(query, time_range, limit)
         except Exception as e:
             logger.error(f"Search failed for {crawler.platform_name}: {e}")
             return CrawlResult.failure(crawler.platform_name, str(e))
 
+        if not result.error:
+            # CrawlResult is frozen, so cached results can be shared safely
+            await self._result_cache.set(cache_key, result, self.RESULT_CACHE_TTL_S)
+        return result
+
     async def _search_xiaohongshu(
         self,
         query: str,
@@ -310,63 +481,8 @@ class PlatformSearchTool(BaseTool):
     def _generate_mock_results(
         self, query: str, platform: str, limit: int
     ) -> List[Dict[str, Any]]:
-        """Generate mock search results."""
-        mock_data = {
-            "zhihu": [
-                {
-                    "id": f"zhihu_{i}",
-                    "platform": "zhihu",
-                    "title": f"{query} 技术深度分析 - 第{i+1}篇",
-                    "summary": f"这是一篇关于 {query} 的专业技术分析文章，探讨了其核心架构和实现原理...",
-                    "author": f"技术专家{i+1}",
-                    "url": f"https://zhihu.com/answer/{100000+i}",
-                    "published_at": "2026-02-01",
-                    "metrics": {"voteup": 1500 - i * 100, "comments": 200 - i * 20},
-                }
-                for i in range(min(limit, 5))
-            ],
-            "wechat": [
-                {
-                    "id": f"wechat_{i}",
-                    "platform": "wechat",
-                    "title": f"{query} 行业报告 - 第{i+1}期",
-                    "summary": f"本文深入分析了 {query} 在行业中的应用前景和商业模式...",
-                    "author": f"AI前沿公众号{i+1}",
-                    "url": f"https://mp.weixin.qq.com/s/mock_{400000+i}",
-                    "published_at": "2026-02-03",
-                    "metrics": {"reads": 10000 - i * 1000, "likes": 500 - i * 50},
-                }
-                for i in range(min(limit, 5))
-            ],
-            "xiaohongshu": [
-                {
-                    "id": f"xhs_{i}",
-                    "platform": "xiaohongshu",
-                    "title": f"实测 {query}！真的太好用了",
-                    "summary": f"今天给大家测评一下 {query}，体验感受和详细教程...",
-                    "author": f"科技博主{i+1}",
-                    "url": f"https://xiaohongshu.com/note/{200000+i}",
-                    "published_at": "2026-02-05",
-                    "metrics": {"likes": 5000 - i * 500, "collects": 1000 - i * 100},
-                }
-                for i in range(min(limit, 5))
-            ],
-            "douyin": [
-                {
-                    "id": f"douyin_{i}",
-                    "platform": "douyin",
-                    "title": f"一分钟带你了解 {query}",
-                    "summary": f"简单易懂的 {query} 科普视频...",
-                    "author": f"科技达人{i+1}",
-                    "url": f"https://douyin.com/video/{300000+i}",
-                    "published_at": "2026-02-04",
-                    "metrics": {"plays": 100000 - i * 10000, "likes": 8000 - i * 800},
-                }
-                for i in range(min(limit, 5))
-            ],
-        }
-
-        return mock_data.get(platform, [])
+        """Generate mock search results (only for the requested platform)."""
+        return list(_mock_results(query, platform, min(limit, 5)))
 
     def _extract_keywords_from_results(
         self, results: List[Dict[str, Any]]
@@ -374,16 +490,12 @@ class PlatformSearchTool(BaseTool):
         """Extract potential keywords from search results for expansion."""
         # In real implementation, this would use NLP
         # For now, return some mock discovered keywords
-        keywords = set()
-        for result in results:
-            title = result.get("title", "")
-            # Simple extraction: find capitalized words or known entities
-            if "DeepSeek" in title and "R1" not in keywords:
-                keywords.add("DeepSeek R1")
-            if "API" in title and "API pricing" not in keywords:
-                keywords.add("API pricing")
-            if "Kimi" in title:
-                keywords.add("Moonshot Kimi")
+        titles = "\n".join(result.get("title", "") for result in results)
+        keywords: Dict[str, None] = {}
+        for match in _KNOWN_ENTITIES_RE.finditer(titles):
+            keywords[_KNOWN_ENTITIES[match.group()]] = None
+            if len(keywords) == len(_KNOWN_ENTITIES):
+                break
 
         return list(keywords)[:3]  # Limit to 3 keywords
 
@@ -4,8 +4,13 @@ Synthesize Tool
 Synthesizes collected data into a coherent intelligence report.
 """
 
+import hashlib
+import re
 from typing import Any, Dict, List, TYPE_CHECKING
 
+import orjson
+
+from app.core.llm.cache import InMemoryLRU
 from app.core.tools.base import BaseTool, ToolParameter, ToolResult
 
 if TYPE_CHECKING:
@@ -30,6 +35,9 @@ SYNTHESIZE_SYSTEM_PROMPT = """你是一个专业的情报综合分析师。你
 
 请以 JSON 格式返回。"""
 
+# JSON object inside a ``` or ```json fence
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
+
 
 class SynthesizeTool(BaseTool):
     """
@@ -38,8 +46,21 @@ class SynthesizeTool(BaseTool):
     Combines all collected and analyzed data into a final intelligence report.
     """
 
-    def __init__(self, llm_router: "LLMRouter"):
+    __slots__ = ("llm", "use_cache", "_cache")
+
+    def __init__(self, llm_router: "LLMRouter", use_cache: bool = True, cache_size: int = 128):
+        """
+        Initialize synthesize tool.
+
+        Args:
+            llm_router: LLM router for synthesis calls
+            use_cache: Reuse reports for identical synthesis inputs (retries,
+                sibling agent runs)
+            cache_size: Max cached reports
+        """
         self.llm = llm_router
+        self.use_cache = use_cache
+        self._cache = InMemoryLRU(maxsize=cache_size)
 
     @property
     def name(self) -> str:
@@ -49,26 +70,24 @@ class SynthesizeTool(BaseTool):
     def description(self) -> str:
         return "综合所有收集和分析的数据，生成最终的情报报告。"
 
-    @property
-    def parameters(self) -> List[ToolParameter]:
-        return [
-            ToolParameter(
-                name="collected_data",
-                type="array",
-                description="收集到的原始数据",
-            ),
-            ToolParameter(
-                name="analysis_results",
-                type="object",
-                description="分析结果",
-                required=False,
-            ),
-            ToolParameter(
-                name="original_command",
-                type="string",
-                description="原始用户命令",
-            ),
-        ]
+    _PARAMETERS = (
+        ToolParameter(
+            name="collected_data",
+            type="array",
+            description="收集到的原始数据",
+        ),
+        ToolParameter(
+            name="analysis_results",
+            type="object",
+            description="分析结果",
+            required=False,
+        ),
+        ToolParameter(
+            name="original_command",
+            type="string",
+            description="原始用户命令",
+        ),
+    )
 
     async def execute(
         self,
@@ -78,6 +97,13 @@ class SynthesizeTool(BaseTool):
         **kwargs,
     ) -> ToolResult:
         """Execute synthesis."""
+        cache_key = None
+        if self.use_cache:
+            cache_key = self._cache_key(collected_data, analysis_results, original_command)
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                return ToolResult.ok(data=cached, tokens_used=0)
+
         # Prepare context for synthesis
         context = self._prepare_synthesis_context(
             collected_data, analysis_results, original_command
@@ -125,6 +151,9 @@ class SynthesizeTool(BaseTool):
             report = self._parse_synthesis_result(result["text"])
             tokens_used = result["usage"]["prompt_tokens"] + result["usage"]["completion_tokens"]
 
+            if cache_key and isinstance(report, dict) and not report.get("parsing_failed"):
+                await self._cache.set(cache_key, report)
+
             return ToolResult.ok(
                 data=report,
                 tokens_used=tokens_used,
@@ -133,6 +162,20 @@ class SynthesizeTool(BaseTool):
         except Exception as e:
             return ToolResult.fail(f"综合分析失败: {str(e)}")
 
+    @staticmethod
+    def _cache_key(
+        collected_data: List[Dict[str, Any]],
+        analysis_results: Dict[str, Any],
+        original_command: str,
+    ) -> str:
+        """Stable hash of the synthesis inputs."""
+        raw = orjson.dumps(
+            {"cmd": original_command, "data": collected_data, "ar": analysis_results},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
     def _prepare_synthesis_context(
         self,
         collected_data: List[Dict[str, Any]],
@@ -140,24 +183,23 @@ class SynthesizeTool(BaseTool):
         original_command: str = "",
     ) -> str:
         """Prepare context string for synthesis."""
-        parts = []
+        parts: List[str] = []
 
         # Add collected data summary
         if collected_data:
             parts.append(f"## 收集的数据 (共 {len(collected_data)} 条)")
-            for i, item in enumerate(collected_data[:15], 1):  # Limit to 15
-                platform = item.get("platform", "unknown")
-                title = item.get("title", "无标题")
-                summary = item.get("summary", "")[:200]
-                parts.append(f"{i}. [{platform}] {title}: {summary}")
+            parts.extend(
+                f"{i}. [{item.get('platform', 'unknown')}] {item.get('title', '无标题')}: "
+                f"{(item.get('summary') or '')[:200]}"
+                for i, item in enumerate(collected_data[:15], 1)  # Limit to 15
+            )
 
         # Add analysis results
         if analysis_results:
             parts.append("\n## 分析结果")
             if "main_points" in analysis_results:
                 parts.append("主要发现:")
-                for point in analysis_results["main_points"]:
-                    parts.append(f"  - {point}")
+                parts.extend(f"  - {point}" for point in analysis_results["main_points"])
 
             if "sentiment" in analysis_results:
                 parts.append(f"情感分析: {analysis_results['sentiment']}")
@@ -171,22 +213,13 @@ class SynthesizeTool(BaseTool):
 
     def _parse_synthesis_result(self, text: str) -> Dict[str, Any]:
         """Parse LLM synthesis result."""
-        import json
-
-        # Try to extract JSON from response
-        text = text.strip()
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            text = text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            text = text[start:end].strip()
+        # Try to extract JSON from a fenced block in the response
+        match = _JSON_FENCE_RE.search(text)
+        text = match.group(1) if match else text.strip()
 
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
             # Return a structured fallback if parsing fails
             return {
                 "executive_summary": text[:200] if len(text) > 200 else text,
@@ -6,6 +6,7 @@ from app.crawlers.base import (
     CrawlResult,
     CrawlerException,
     RateLimitedException,
+    TransientHTTPException,
     BlockedException,
     CaptchaException,
     ParseException,
@@ -17,6 +18,7 @@ __all__ = [
     "CrawlResult",
     "CrawlerException",
     "RateLimitedException",
+    "TransientHTTPException",
     "BlockedException",
     "CaptchaException",
     "ParseException",
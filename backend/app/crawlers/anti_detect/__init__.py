@@ -1,7 +1,7 @@
 """Anti-detect module."""
 
 from app.crawlers.anti_detect.anti_detect import AntiDetect, get_anti_detect
-from app.crawlers.anti_detect.proxy_pool import ProxyPool, get_proxy_pool
+from app.crawlers.anti_detect.proxy_pool import ProxyPool, close_proxy_pool, get_proxy_pool
 from app.crawlers.anti_detect.rate_limiter import RateLimiter, get_rate_limiter
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     "get_anti_detect",
     "ProxyPool",
     "get_proxy_pool",
+    "close_proxy_pool",
     "RateLimiter",
     "get_rate_limiter",
 ]
@@ -4,8 +4,9 @@ Anti-Detection Module
 Provides browser fingerprint randomization to avoid detection.
 """
 
+import functools
 import random
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 
 
 class AntiDetect:
@@ -19,7 +20,7 @@ class AntiDetect:
     """
 
     # Common User-Agent strings (updated for 2026)
-    USER_AGENTS: List[str] = [
+    USER_AGENTS: Tuple[str, ...] = (
         # Chrome on Windows
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -35,38 +36,51 @@ class AntiDetect:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
         # Edge on Windows
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0",
-    ]
+    )
 
     # Accept-Language variations
-    ACCEPT_LANGUAGES: List[str] = [
+    ACCEPT_LANGUAGES: Tuple[str, ...] = (
         "zh-CN,zh;q=0.9,en;q=0.8",
         "zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7",
         "zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2",
         "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7",
-    ]
+    )
 
     # Platform-specific referer patterns
-    REFERERS: Dict[str, List[str]] = {
-        "zhihu": [
+    REFERERS: Dict[str, Tuple[str, ...]] = {
+        "zhihu": (
             "https://www.zhihu.com/",
             "https://www.zhihu.com/search",
             "https://www.zhihu.com/hot",
-        ],
-        "wechat": [
+        ),
+        "wechat": (
             "https://weixin.sogou.com/",
             "https://mp.weixin.qq.com/",
-        ],
-        "xiaohongshu": [
+        ),
+        "xiaohongshu": (
             "https://www.xiaohongshu.com/",
             "https://www.xiaohongshu.com/explore",
-        ],
-        "douyin": [
+        ),
+        "douyin": (
             "https://www.douyin.com/",
             "https://www.douyin.com/search",
-        ],
+        ),
     }
 
+    # Origin header per platform (derived from the first referer)
+    ORIGINS: Dict[str, str] = {k: v[0].rstrip("/") for k, v in REFERERS.items()}
+
+    # Size of the pre-sampled User-Agent ring (power of two for masking)
+    UA_RING_SIZE = 4096
+
     def __init__(self):
+        # Per-instance RNG (avoids the shared module-level generator)
+        self._rng = random.Random()
+        # Rotations read the next pre-sampled pick instead of sampling per call
+        self._ua_ring: Tuple[str, ...] = tuple(
+            self._rng.choices(self.USER_AGENTS, k=self.UA_RING_SIZE)
+        )
+        self._ua_ring_idx = 0
         self._current_ua: Optional[str] = None
         self._cookie_store: Dict[str, Dict[str, str]] = {}
 
@@ -80,23 +94,13 @@ class AntiDetect:
         Returns:
             Dict of HTTP headers
         """
-        headers = {
-            "User-Agent": self._get_user_agent(),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": random.choice(self.ACCEPT_LANGUAGES),
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-        }
+        referers = self.REFERERS.get(platform) if platform else None
+        headers = dict(self._page_headers(self._get_user_agent(), bool(referers)))
+        headers["Accept-Language"] = self._rng.choice(self.ACCEPT_LANGUAGES)
 
         # Add platform-specific referer
-        if platform and platform in self.REFERERS:
-            headers["Referer"] = random.choice(self.REFERERS[platform])
+        if referers:
+            headers["Referer"] = self._rng.choice(referers)
 
         return headers
 
@@ -110,36 +114,75 @@ class AntiDetect:
         Returns:
             Dict of HTTP headers for API requests
         """
+        referers = self.REFERERS.get(platform) if platform else None
+        origin = self.ORIGINS.get(platform) if referers else None
+        headers = dict(self._api_headers(self._get_user_agent(), origin))
+        headers["Accept-Language"] = self._rng.choice(self.ACCEPT_LANGUAGES)
+
+        if referers:
+            headers["Referer"] = self._rng.choice(referers)
+
+        return headers
+
+    # The static part of the headers is built once per User-Agent (and
+    # referer/origin); randomized fields are filled into a copy per request.
+    # Placeholders keep the header order stable.
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _page_headers(user_agent: str, with_referer: bool) -> Dict[str, str]:
         headers = {
-            "User-Agent": self._get_user_agent(),
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+            "Accept-Language": "",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+            "Sec-Fetch-User": "?1",
+            "Cache-Control": "max-age=0",
+        }
+        if with_referer:
+            headers["Referer"] = ""
+        return headers
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _api_headers(user_agent: str, origin: Optional[str]) -> Dict[str, str]:
+        headers = {
+            "User-Agent": user_agent,
             "Accept": "application/json, text/plain, */*",
-            "Accept-Language": random.choice(self.ACCEPT_LANGUAGES),
+            "Accept-Language": "",
             "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
             "Sec-Fetch-Dest": "empty",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Site": "same-origin",
         }
-
-        if platform and platform in self.REFERERS:
-            headers["Referer"] = random.choice(self.REFERERS[platform])
-            headers["Origin"] = self.REFERERS[platform][0].rstrip("/")
-
+        if origin:
+            headers["Referer"] = ""
+            headers["Origin"] = origin
         return headers
 
     def _get_user_agent(self) -> str:
         """Get a random User-Agent (with some session persistence)."""
         # 70% chance to reuse current UA for session consistency
-        if self._current_ua and random.random() < 0.7:
+        if self._current_ua and self._rng.random() < 0.7:
             return self._current_ua
 
-        self._current_ua = random.choice(self.USER_AGENTS)
+        return self._next_user_agent()
+
+    def _next_user_agent(self) -> str:
+        """Advance to the next pre-sampled User-Agent."""
+        self._current_ua = self._ua_ring[self._ua_ring_idx & (self.UA_RING_SIZE - 1)]
+        self._ua_ring_idx += 1
         return self._current_ua
 
     def rotate_user_agent(self) -> str:
         """Force rotation to a new User-Agent."""
-        self._current_ua = random.choice(self.USER_AGENTS)
-        return self._current_ua
+        return self._next_user_agent()
 
     def get_cookies(self, platform: str) -> Dict[str, str]:
         """
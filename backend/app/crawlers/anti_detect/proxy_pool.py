@@ -5,10 +5,43 @@ Manages a pool of proxies with health tracking.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Set
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
 
 from app.config import settings
 
+# Atomically lease the best proxy not currently in use (or the best one if
+# all are leased) and record the lease, in one round trip.
+# KEYS[1] = pool zset, KEYS[2] = in-use zset scored by lease expiry (ms)
+# ARGV[1] = now (ms), ARGV[2] = lease duration (ms)
+_LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local best = nil
+local offset = 0
+while true do
+    local batch = redis.call('ZREVRANGE', KEYS[1], offset, offset + 15)
+    if #batch == 0 then
+        break
+    end
+    if not best then
+        best = batch[1]
+    end
+    for _, proxy in ipairs(batch) do
+        if not redis.call('ZSCORE', KEYS[2], proxy) then
+            redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), proxy)
+            return proxy
+        end
+    end
+    offset = offset + 16
+end
+if best then
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), best)
+end
+return best
+"""
+
 
 class ProxyPool:
     """
@@ -21,6 +54,11 @@ class ProxyPool:
     - Optional Redis-backed persistence
     """
 
+    # How long a Redis lease holds a proxy if it's never released
+    LEASE_TTL_MS = 60_000
+    # How often buffered score updates are written to Redis
+    FLUSH_INTERVAL_S = 2.0
+
     def __init__(self, redis_client=None):
         """
         Initialize proxy pool.
@@ -32,6 +70,13 @@ class ProxyPool:
         self._proxies: Dict[str, float] = {}  # proxy -> score
         self._failed_count: Dict[str, int] = {}  # proxy -> failure count
         self._in_use: Set[str] = set()
+        self._lease_script: Optional[Any] = None
+
+        # Redis score bookkeeping is buffered and flushed periodically
+        self._score_deltas: Dict[str, int] = defaultdict(int)
+        self._failure_deltas: Dict[str, int] = defaultdict(int)
+        self._released: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
 
         # Configuration
         self.max_failures = 5  # Remove proxy after this many failures
@@ -51,10 +96,32 @@ class ProxyPool:
             self._proxies[proxy] = initial_score
             self._failed_count[proxy] = 0
 
-    async def add_many(self, proxies: List[str], initial_score: float = 1.0) -> None:
-        """Add multiple proxies to the pool."""
-        for proxy in proxies:
-            await self.add(proxy, initial_score)
+    async def add_many(
+        self, proxies: List[str], initial_score: float = 1.0, pipeline=None
+    ) -> None:
+        """
+        Add multiple proxies to the pool.
+
+        With Redis this is a single ZADD of all proxies (one round trip).
+
+        Args:
+            proxies: Proxy URLs
+            initial_score: Initial health score
+            pipeline: Optional Redis pipeline to queue the ZADD on; the caller
+                executes it together with its other writes
+        """
+        if not proxies:
+            return
+
+        if self.redis:
+            mapping = dict.fromkeys(proxies, initial_score)
+            if pipeline is not None:
+                pipeline.zadd("crawler:proxy_pool", mapping)
+            else:
+                await self.redis.zadd("crawler:proxy_pool", mapping)
+        else:
+            self._proxies.update(dict.fromkeys(proxies, initial_score))
+            self._failed_count.update(dict.fromkeys(proxies, 0))
 
     async def get(self) -> Optional[str]:
         """
@@ -64,36 +131,38 @@ class ProxyPool:
             Proxy URL, or None if pool is empty
         """
         if self.redis:
-            # Get highest-scoring proxy from Redis
-            result = await self.redis.zrevrange(
-                "crawler:proxy_pool", 0, 0, withscores=True
+            # Pick and lease atomically so concurrent workers don't share a proxy
+            if self._lease_script is None:
+                self._lease_script = self.redis.register_script(_LEASE_SCRIPT)
+            return await self._lease_script(
+                keys=["crawler:proxy_pool", "crawler:proxy_inuse"],
+                args=[int(time.time() * 1000), self.LEASE_TTL_MS],
             )
-            if result:
-                return result[0][0]
-            return None
         else:
             if not self._proxies:
                 return None
 
-            # Get proxy with highest score that's not in use
-            available = [
-                (p, s) for p, s in self._proxies.items()
-                if p not in self._in_use
-            ]
+            # Get proxy with highest score that's not in use (single pass, no sort)
+            score = self._proxies.__getitem__
+            proxy = max(
+                (p for p in self._proxies if p not in self._in_use),
+                key=score,
+                default=None,
+            )
 
-            if not available:
+            if proxy is None:
                 # All proxies in use, return best one anyway
-                available = list(self._proxies.items())
+                proxy = max(self._proxies, key=score)
 
-            # Sort by score descending
-            available.sort(key=lambda x: x[1], reverse=True)
-            proxy = available[0][0]
             self._in_use.add(proxy)
             return proxy
 
     async def release(self, proxy: str) -> None:
         """Release a proxy back to the pool."""
-        self._in_use.discard(proxy)
+        if self.redis:
+            await self.redis.zrem("crawler:proxy_inuse", proxy)
+        else:
+            self._in_use.discard(proxy)
 
     async def mark_success(self, proxy: str) -> None:
         """
@@ -103,9 +172,11 @@ class ProxyPool:
             proxy: Proxy URL
         """
         if self.redis:
-            await self.redis.zincrby("crawler:proxy_pool", 1, proxy)
-            # Reset failure count
-            await self.redis.hdel("crawler:proxy_failed", proxy)
+            self._score_deltas[proxy] += 1
+            # A success resets the failure count; the flush sends the HDEL
+            self._failure_deltas[proxy] = 0
+            self._released.add(proxy)
+            self._ensure_flush_task()
         else:
             if proxy in self._proxies:
                 self._proxies[proxy] = min(self._proxies[proxy] + 1, 10)
@@ -120,13 +191,10 @@ class ProxyPool:
             proxy: Proxy URL
         """
         if self.redis:
-            await self.redis.zincrby("crawler:proxy_pool", -2, proxy)
-            failures = await self.redis.hincrby("crawler:proxy_failed", proxy, 1)
-
-            # Remove if too many failures
-            if failures > self.max_failures:
-                await self.redis.zrem("crawler:proxy_pool", proxy)
-                await self.redis.hdel("crawler:proxy_failed", proxy)
+            self._score_deltas[proxy] -= 2
+            self._failure_deltas[proxy] += 1
+            self._released.add(proxy)
+            self._ensure_flush_task()
         else:
             if proxy in self._proxies:
                 self._proxies[proxy] -= 2
@@ -142,11 +210,66 @@ class ProxyPool:
 
             self._in_use.discard(proxy)
 
+    def _ensure_flush_task(self) -> None:
+        """Start the background flush loop on first use."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Periodically write buffered score updates to Redis."""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_S)
+            try:
+                await self.flush()
+            except Exception:
+                # Keep flushing on transient Redis errors; the deltas are
+                # dropped rather than retried
+                pass
+
+    async def flush(self) -> None:
+        """Write buffered score, failure and lease updates to Redis in one pipeline."""
+        if not self.redis or not (self._score_deltas or self._released):
+            return
+
+        score_deltas, self._score_deltas = self._score_deltas, defaultdict(int)
+        failure_deltas, self._failure_deltas = self._failure_deltas, defaultdict(int)
+        released, self._released = self._released, set()
+
+        pipe = self.redis.pipeline(transaction=False)
+        if released:
+            pipe.zrem("crawler:proxy_inuse", *released)
+        for proxy, delta in score_deltas.items():
+            if delta:
+                pipe.zadd("crawler:proxy_pool", {proxy: delta}, xx=True, incr=True)
+        # Queued last so their replies line up with failure_deltas
+        for proxy, failures in failure_deltas.items():
+            if failures:
+                pipe.hincrby("crawler:proxy_failed", proxy, failures)
+            else:
+                pipe.hdel("crawler:proxy_failed", proxy)
+        results = await pipe.execute()
+
+        # Remove proxies with too many failures
+        failure_replies = results[len(results) - len(failure_deltas):]
+        for (proxy, failures), total in zip(failure_deltas.items(), failure_replies):
+            if failures and total > self.max_failures:
+                await self.remove(proxy)
+
+    async def close(self) -> None:
+        """Stop the flush loop and write any pending updates."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
     async def remove(self, proxy: str) -> None:
         """Remove a proxy from the pool."""
         if self.redis:
-            await self.redis.zrem("crawler:proxy_pool", proxy)
-            await self.redis.hdel("crawler:proxy_failed", proxy)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem("crawler:proxy_pool", proxy)
+            pipe.hdel("crawler:proxy_failed", proxy)
+            pipe.zrem("crawler:proxy_inuse", proxy)
+            await pipe.execute()
         else:
             self._proxies.pop(proxy, None)
             self._failed_count.pop(proxy, None)
@@ -170,6 +293,7 @@ class ProxyPool:
         if self.redis:
             await self.redis.delete("crawler:proxy_pool")
             await self.redis.delete("crawler:proxy_failed")
+            await self.redis.delete("crawler:proxy_inuse")
         else:
             self._proxies.clear()
             self._failed_count.clear()
@@ -190,3 +314,9 @@ def get_proxy_pool(redis_client=None) -> ProxyPool:
     if _proxy_pool is None:
         _proxy_pool = ProxyPool(redis_client)
     return _proxy_pool
+
+
+async def close_proxy_pool() -> None:
+    """Flush the global pool's pending updates (call on application shutdown)."""
+    if _proxy_pool is not None:
+        await _proxy_pool.close()
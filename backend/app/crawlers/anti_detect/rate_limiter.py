@@ -6,7 +6,24 @@ Controls request rate to avoid triggering platform rate limits.
 
 import asyncio
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+# Atomic acquire: returns 0 and records the request if the interval has
+# elapsed, otherwise the milliseconds left to wait.
+# KEYS[1] = limiter key, ARGV[1] = now (ms), ARGV[2] = interval (ms)
+_ACQUIRE_SCRIPT = """
+local last = redis.call('GET', KEYS[1])
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+if last then
+    local wait = interval - (now - tonumber(last))
+    if wait > 0 then
+        return wait
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', interval)
+return 0
+"""
 
 
 class RateLimiter:
@@ -39,20 +56,23 @@ class RateLimiter:
             redis_client: Optional Redis client for distributed limiting
         """
         self.limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self._intervals = self._build_intervals(self.limits)
         self.redis = redis_client
-        self._last_request: Dict[str, float] = {}
-        self._locks: Dict[str, asyncio.Lock] = {}
-
-    def _get_lock(self, platform: str) -> asyncio.Lock:
-        """Get or create lock for a platform."""
-        if platform not in self._locks:
-            self._locks[platform] = asyncio.Lock()
-        return self._locks[platform]
+        # Earliest monotonic time the next local request may start, per platform
+        self._next_allowed: Dict[str, float] = {}
+        # Slots given up by cancelled waiters that still had others queued
+        # behind them, per platform: slot end -> slot start
+        self._abandoned: Dict[str, Dict[float, float]] = {}
+        self._acquire_script: Optional[Any] = None
+
+    @staticmethod
+    def _build_intervals(limits: Dict[str, float]) -> Dict[str, float]:
+        """Precompute the minimum interval between requests per platform."""
+        return {p: 1.0 / rate if rate > 0 else 0.0 for p, rate in limits.items()}
 
     def _get_interval(self, platform: str) -> float:
         """Get the minimum interval between requests for a platform."""
-        rate = self.limits.get(platform, self.limits["default"])
-        return 1.0 / rate if rate > 0 else 0
+        return self._intervals.get(platform, self._intervals["default"])
 
     async def wait(self, platform: str) -> None:
         """
@@ -68,37 +88,69 @@ class RateLimiter:
 
     async def _wait_local(self, platform: str) -> None:
         """Local (in-memory) rate limiting."""
-        async with self._get_lock(platform):
-            interval = self._get_interval(platform)
-            last = self._last_request.get(platform, 0)
-            now = time.time()
+        # Reserve the next slot before sleeping; the read-modify-write has no
+        # await in between, so concurrent callers on the event loop queue up
+        # without a lock
+        now = time.monotonic()
+        start = max(self._next_allowed.get(platform, 0.0), now)
+        end = start + self._get_interval(platform)
+        self._next_allowed[platform] = end
+        if start > now:
+            try:
+                await asyncio.sleep(start - now)
+            except asyncio.CancelledError:
+                self._release_local_slot(platform, start, end)
+                raise
+
+    def _release_local_slot(self, platform: str, start: float, end: float) -> None:
+        """
+        Give back a slot reserved by a cancelled waiter.
 
-            elapsed = now - last
-            if elapsed < interval:
-                wait_time = interval - elapsed
-                await asyncio.sleep(wait_time)
+        Only the tail of the schedule can be rolled back; a slot with others
+        queued behind it is remembered, and rolled back once the slots after
+        it have been given up too. Otherwise every timed-out caller would push
+        the platform's schedule further out.
+        """
+        abandoned = self._abandoned.setdefault(platform, {})
+        if self._next_allowed.get(platform) != end:
+            abandoned[end] = start
+            return
+
+        tail = start
+        while tail in abandoned:
+            tail = abandoned.pop(tail)
+        self._next_allowed[platform] = tail
+
+        # Forget slots that have already passed
+        now = time.monotonic()
+        for slot_end in [e for e in abandoned if e <= now]:
+            del abandoned[slot_end]
+
+    async def _try_acquire_redis(self, platform: str) -> int:
+        """
+        Try to take the platform's slot in Redis.
 
-            self._last_request[platform] = time.time()
+        Returns 0 if acquired, otherwise the milliseconds until the next slot.
+        """
+        interval_ms = int(self._get_interval(platform) * 1000)
+        if interval_ms <= 0:
+            return 0
+
+        if self._acquire_script is None:
+            # EVALSHA, falling back to EVAL if the script isn't loaded yet
+            self._acquire_script = self.redis.register_script(_ACQUIRE_SCRIPT)
+        wait_ms = await self._acquire_script(
+            keys=[f"crawler:rate_limit:{platform}"],
+            args=[int(time.time() * 1000), interval_ms],
+        )
+        return int(wait_ms)
 
     async def _wait_redis(self, platform: str) -> None:
         """Redis-based distributed rate limiting."""
-        key = f"crawler:rate_limit:{platform}"
-        interval = self._get_interval(platform)
-
-        while True:
-            # Try to set the key with expiration
-            # If set successfully, we can proceed
-            result = await self.redis.set(
-                key, "1",
-                ex=max(1, int(interval)),
-                nx=True,
-            )
-
-            if result:
-                return
-
-            # Key exists, wait and retry
-            await asyncio.sleep(0.1)
+        # The script reports the exact remaining wait, so sleep that long
+        # instead of polling
+        while wait_ms := await self._try_acquire_redis(platform):
+            await asyncio.sleep(wait_ms / 1000)
 
     async def acquire(self, platform: str) -> bool:
         """
@@ -111,17 +163,11 @@ class RateLimiter:
             True if acquired, False if rate limited
         """
         if self.redis:
-            key = f"crawler:rate_limit:{platform}"
-            interval = self._get_interval(platform)
-            result = await self.redis.set(key, "1", ex=max(1, int(interval)), nx=True)
-            return bool(result)
+            return await self._try_acquire_redis(platform) == 0
         else:
-            interval = self._get_interval(platform)
-            last = self._last_request.get(platform, 0)
-            now = time.time()
-
-            if now - last >= interval:
-                self._last_request[platform] = now
+            now = time.monotonic()
+            if self._next_allowed.get(platform, 0.0) <= now:
+                self._next_allowed[platform] = now + self._get_interval(platform)
                 return True
             return False
 
@@ -134,6 +180,7 @@ class RateLimiter:
             requests_per_second: Maximum requests per second
         """
         self.limits[platform] = requests_per_second
+        self._intervals[platform] = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
 
     def get_limit(self, platform: str) -> float:
         """Get rate limit for a platform."""
@@ -5,14 +5,24 @@ Defines the base class and interfaces for platform crawlers.
 """
 
 import asyncio
+import functools
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from app.core.llm.cache import InMemoryLRU
+from app.crawlers.http import get_shared_session
 
 
-class CrawlItem(BaseModel):
+@functools.lru_cache(maxsize=2)
+def _format_timestamp(epoch_seconds: int) -> str:
+    """Format a whole-second timestamp (items built in the same second share it)."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch_seconds))
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CrawlItem:
     """A single crawled item."""
 
     id: str
@@ -24,21 +34,38 @@ class CrawlItem(BaseModel):
     author_id: Optional[str] = None
     url: Optional[str] = None
     published_at: Optional[str] = None
-    collected_at: str = Field(default_factory=lambda: time.strftime("%Y-%m-%d %H:%M:%S"))
-    metrics: Dict[str, Any] = Field(default_factory=dict)
+    collected_at: str = field(default_factory=lambda: _format_timestamp(int(time.time())))
+    metrics: Dict[str, Any] = field(default_factory=dict)
     raw_data: Optional[Dict[str, Any]] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CrawlItem":
+        """Create an item from a dict (unknown keys are ignored)."""
+        return cls(**{k: v for k, v in data.items() if k in _CRAWL_ITEM_FIELDS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return asdict(self)
+
+
+_CRAWL_ITEM_FIELDS = frozenset(f.name for f in fields(CrawlItem))
 
-class CrawlResult(BaseModel):
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CrawlResult:
     """Result of a crawl operation."""
 
     platform: str
-    items: List[CrawlItem] = Field(default_factory=list)
+    items: List[CrawlItem] = field(default_factory=list)
     total_found: int = 0
     has_more: bool = False
     next_cursor: Optional[str] = None
     error: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return asdict(self)
+
     @classmethod
     def success(
         cls,
@@ -75,6 +102,12 @@ class RateLimitedException(CrawlerException):
     pass
 
 
+class TransientHTTPException(CrawlerException):
+    """Raised on a retriable server error (502/503/504, ...)."""
+
+    pass
+
+
 class BlockedException(CrawlerException):
     """Raised when blocked by the platform."""
 
@@ -93,6 +126,13 @@ class ParseException(CrawlerException):
     pass
 
 
+# 5xx statuses worth retrying (429 is handled as RateLimitedException)
+RETRIABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+# Successful GET responses, shared by all crawlers (keyed by platform + URL)
+_response_cache = InMemoryLRU(maxsize=4096)
+
+
 class BaseCrawler(ABC):
     """
     Base class for all platform crawlers.
@@ -103,6 +143,16 @@ class BaseCrawler(ABC):
     - Error handling
     """
 
+    # Maximum pages of one search fetched concurrently
+    PAGE_CONCURRENCY = 3
+
+    # Timeout per HTTP attempt; starts after the rate-limiter wait
+    REQUEST_TIMEOUT_S = 15.0
+
+    # Response cache TTLs for _request(cache_ttl=...)
+    SEARCH_CACHE_TTL_S = 600
+    DETAIL_CACHE_TTL_S = 86400
+
     def __init__(
         self,
         proxy_pool: Optional["ProxyPool"] = None,
@@ -159,25 +209,18 @@ class BaseCrawler(ABC):
         pass
 
     async def _get_session(self):
-        """Get or create aiohttp session."""
+        """
+        Get the aiohttp session (the process-wide pooled session by default).
+
+        The shared session has a single cookie jar, so cookies set by one
+        platform's responses are not isolated from the other crawlers.
+        """
         if self._session is None:
-            import aiohttp
-
-            # Configure session with anti-detection
-            connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=5,
-                ttl_dns_cache=300,
-            )
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
-            )
+            return get_shared_session()
         return self._session
 
     async def close(self):
-        """Close the session."""
+        """Close the crawler's own session; the shared session outlives crawlers."""
         if self._session:
             await self._session.close()
             self._session = None
@@ -187,6 +230,8 @@ class BaseCrawler(ABC):
         url: str,
         method: str = "GET",
         max_retries: int = 3,
+        cache_ttl: Optional[int] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
         **kwargs,
     ) -> Any:
         """
@@ -196,7 +241,13 @@ class BaseCrawler(ABC):
             url: Request URL
             method: HTTP method
             max_retries: Maximum retry attempts
-            **kwargs: Additional request parameters
+            cache_ttl: If set, successful GET responses are cached for this
+                many seconds and served without a request
+            cache_if: Optional predicate on the response data; responses it
+                rejects (e.g. a captcha page served with 200) are not cached
+            **kwargs: Additional request parameters. Headers passed by the
+                caller (typically already from anti_detect) are sent as-is;
+                otherwise fresh anti-detection headers are used per attempt.
 
         Returns:
             Response data (JSON or text)
@@ -204,7 +255,20 @@ class BaseCrawler(ABC):
         Raises:
             CrawlerException on failure
         """
+        cache_key = None
+        if cache_ttl and method == "GET":
+            cache_key = f"{self.platform_name}\0{url}"
+            cached = await _response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        import aiohttp
+
         session = await self._get_session()
+        caller_headers = kwargs.pop("headers", None)
+        request_timeout = kwargs.pop("timeout", None) or aiohttp.ClientTimeout(
+            total=self.REQUEST_TIMEOUT_S
+        )
 
         for attempt in range(max_retries):
             try:
@@ -213,9 +277,9 @@ class BaseCrawler(ABC):
                     await self.rate_limiter.wait(self.platform_name)
 
                 # Get anti-detection headers
-                headers = kwargs.pop("headers", {})
-                if self.anti_detect:
-                    headers.update(self.anti_detect.get_headers())
+                headers = caller_headers
+                if headers is None and self.anti_detect:
+                    headers = self.anti_detect.get_headers(self.platform_name)
 
                 # Get proxy if available
                 proxy = None
@@ -227,6 +291,7 @@ class BaseCrawler(ABC):
                     url,
                     headers=headers,
                     proxy=proxy,
+                    timeout=request_timeout,
                     **kwargs,
                 ) as response:
                     # Handle different status codes
@@ -238,9 +303,13 @@ class BaseCrawler(ABC):
                         # Return based on content type
                         content_type = response.headers.get("Content-Type", "")
                         if "application/json" in content_type:
-                            return await response.json()
+                            data = await response.json()
                         else:
-                            return await response.text()
+                            data = await response.text()
+
+                        if cache_key is not None and (cache_if is None or cache_if(data)):
+                            await _response_cache.set(cache_key, data, cache_ttl)
+                        return data
 
                     elif response.status == 403:
                         # Blocked - try switching proxy
@@ -252,7 +321,13 @@ class BaseCrawler(ABC):
                         # Rate limited
                         raise RateLimitedException(f"Rate limited by {self.platform_name}")
 
+                    elif response.status in RETRIABLE_STATUSES:
+                        raise TransientHTTPException(
+                            f"HTTP {response.status} from {self.platform_name}"
+                        )
+
                     else:
+                        # Permanent failure (404, 400, ...) - don't retry
                         raise CrawlerException(
                             f"HTTP {response.status} from {self.platform_name}"
                         )
@@ -265,12 +340,22 @@ class BaseCrawler(ABC):
                     continue
                 raise
 
+            except TransientHTTPException:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1)
+                    continue
+                raise
+
+            except CrawlerException:
+                raise
+
             except asyncio.TimeoutError:
                 if attempt < max_retries - 1:
                     continue
                 raise CrawlerException(f"Request timeout to {self.platform_name}")
 
             except Exception as e:
+                # Connection errors and the like are treated as transient
                 if attempt < max_retries - 1:
                     await asyncio.sleep(1)
                     continue
@@ -278,6 +363,27 @@ class BaseCrawler(ABC):
 
         raise CrawlerException(f"Max retries exceeded for {self.platform_name}")
 
+    async def _gather_pages(
+        self,
+        fetch: Callable[[Any], Awaitable[Any]],
+        pages: Iterable[Any],
+    ) -> List[Union[Any, BaseException]]:
+        """
+        Fetch several result pages concurrently (at most PAGE_CONCURRENCY at once).
+
+        Each fetch still goes through _request, so rate limiting applies per
+        request. Results are returned in page order; a failed page is
+        returned as its exception so callers can stop at the same point a
+        sequential loop would.
+        """
+        semaphore = asyncio.Semaphore(self.PAGE_CONCURRENCY)
+
+        async def bounded(page: Any) -> Any:
+            async with semaphore:
+                return await fetch(page)
+
+        return await asyncio.gather(*(bounded(p) for p in pages), return_exceptions=True)
+
     def _parse_time_range(self, time_range: str) -> int:
         """Convert time range string to days."""
         mapping = {
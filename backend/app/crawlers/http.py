@@ -0,0 +1,61 @@
+"""
+Shared HTTP Session for Crawlers
+
+A single pooled aiohttp.ClientSession reused by all platform crawlers so
+TCP/TLS connections and DNS lookups are kept alive across searches instead
+of being re-established per crawler instance.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_connector: Optional["aiohttp.TCPConnector"] = None
+_session: Optional["aiohttp.ClientSession"] = None
+
+
+def get_shared_connector() -> "aiohttp.TCPConnector":
+    """
+    Get or create the shared TCP connector (connection pool + DNS cache).
+
+    Sessions built on it must pass ``connector_owner=False`` so closing a
+    session doesn't tear down the pool for everyone else.
+    """
+    global _connector
+    if _connector is None or _connector.closed:
+        import aiohttp
+
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=600,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True,
+        )
+    return _connector
+
+
+def get_shared_session() -> "aiohttp.ClientSession":
+    """Get or create the shared crawler session (must be called inside the event loop)."""
+    global _session
+    if _session is None or _session.closed:
+        import aiohttp
+
+        _session = aiohttp.ClientSession(
+            connector=get_shared_connector(),
+            connector_owner=False,
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return _session
+
+
+async def close_crawler_session() -> None:
+    """Close the shared crawler session and connector (call on application shutdown)."""
+    global _session, _connector
+    if _session is not None:
+        await _session.close()
+        _session = None
+    if _connector is not None:
+        await _connector.close()
+        _connector = None
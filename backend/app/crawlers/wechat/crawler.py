@@ -8,7 +8,7 @@ import hashlib
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from urllib.parse import quote, urlencode
 
 from app.crawlers.base import (
@@ -20,6 +20,77 @@ from app.crawlers.base import (
 )
 from app.crawlers.anti_detect import AntiDetect, ProxyPool, RateLimiter
 
+# Sogou result-page patterns (compiled once, reused for every item)
+_TXT_BOX_START = '<div class="txt-box">'
+_TXT_BOX_END_RE = re.compile(r'</div>\s*</li>')
+_ALT_ARTICLE_RE = re.compile(r'<li[^>]*id="sogou_vr_\d+_box[^>]*"[^>]*>(.*?)</li>', re.DOTALL)
+_TITLE_RE = re.compile(r'<a[^>]*target="_blank"[^>]*>(.*?)</a>', re.DOTALL)
+_HREF_RE = re.compile(r'href="([^"]+)"')
+_TXT_INFO_RE = re.compile(r'<p class="txt-info"[^>]*>(.*?)</p>', re.DOTALL)
+_ACCOUNT_RE = re.compile(r'<a[^>]*class="account"[^>]*>(.*?)</a>', re.DOTALL)
+_SP_RE = re.compile(r'<span class="s-p"[^>]*>(.*?)</span>')
+_DATE_RE = re.compile(r'(\d{4}[-年]\d{1,2}[-月]\d{1,2}日?)')
+_ACCOUNT_ITEM_RE = re.compile(r'<li[^>]*class="news-box"[^>]*>(.*?)</li>', re.DOTALL)
+_NAME_RE = re.compile(r'<p class="tit"[^>]*>(.*?)</p>', re.DOTALL)
+_WECHAT_ID_RE = re.compile(r'微信号[：:]\s*([a-zA-Z0-9_-]+)')
+_DESC_RE = re.compile(r'<span class="sp-txt"[^>]*>(.*?)</span>', re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+
+# Tags (including <em> highlighting) and the entities Sogou emits, stripped
+# or decoded in a single pass
+_HTML_ENTITIES = {
+    "&nbsp;": " ",
+    "&lt;": "<",
+    "&gt;": ">",
+    "&amp;": "&",
+    "&quot;": '"',
+    "&#39;": "'",
+}
+_CLEAN_RE = re.compile(r'<[^>]+>|&(?:nbsp|lt|gt|amp|quot|#39);')
+
+
+def _iter_txt_boxes(html: str) -> Iterator[str]:
+    """
+    Yield the body of each ``<div class="txt-box">`` result up to its
+    closing ``</div></li>``.
+
+    Same matches as ``<div class="txt-box">(.*?)</div>\\s*</li>`` with
+    DOTALL, but the start marker is located with str.find and the end is a
+    literal-prefixed search, so the page isn't scanned by a lazy ``.*?``.
+    """
+    pos = html.find(_TXT_BOX_START)
+    while pos != -1:
+        body_start = pos + len(_TXT_BOX_START)
+        end = _TXT_BOX_END_RE.search(html, body_start)
+        if end is None:
+            return
+        yield html[body_start:end.start()]
+        pos = html.find(_TXT_BOX_START, end.end())
+
+
+def _has_article_results(response: Any) -> bool:
+    """
+    Whether a search response lists articles (cache_if for _request).
+
+    Sogou answers with a 200 antispider/captcha page when it blocks us;
+    caching that would serve an empty result for the whole TTL.
+    """
+    if not isinstance(response, str):
+        return False
+    return next(_iter_txt_boxes(response), None) is not None or bool(
+        _ALT_ARTICLE_RE.search(response)
+    )
+
+
+def _has_account_results(response: Any) -> bool:
+    """Whether an account search response lists accounts (cache_if for _request)."""
+    return isinstance(response, str) and bool(_ACCOUNT_ITEM_RE.search(response))
+
+
+def _clean_match(match: "re.Match[str]") -> str:
+    """Replacement for _CLEAN_RE: decoded entity, or empty for a tag."""
+    return _HTML_ENTITIES.get(match.group(0), "")
+
 
 class WeChatCrawler(BaseCrawler):
     """
@@ -39,6 +110,9 @@ class WeChatCrawler(BaseCrawler):
     SEARCH_TYPE_ARTICLE = 2  # Article search
     SEARCH_TYPE_ACCOUNT = 1  # Account search
 
+    # Maximum result pages fetched per search
+    MAX_SEARCH_PAGES = 5
+
     def __init__(
         self,
         proxy_pool: Optional[ProxyPool] = None,
@@ -73,14 +147,12 @@ class WeChatCrawler(BaseCrawler):
             CrawlResult with search results
         """
         try:
-            items = []
-            page = 1
             page_size = 10  # Sogou default
 
             # Convert time_range to Sogou's inttime parameter
             inttime = self._get_inttime(time_range)
 
-            while len(items) < limit:
+            async def fetch_page(page: int) -> List[CrawlItem]:
                 # Build search URL
                 params = {
                     "type": self.SEARCH_TYPE_ARTICLE,
@@ -99,28 +171,36 @@ class WeChatCrawler(BaseCrawler):
                 if self.anti_detect:
                     headers = self.anti_detect.get_headers("wechat")
 
-                response = await self._request(url, headers=headers)
+                response = await self._request(
+                    url,
+                    headers=headers,
+                    cache_ttl=self.SEARCH_CACHE_TTL_S,
+                    cache_if=_has_article_results,
+                )
 
                 if not isinstance(response, str):
                     raise ParseException("Invalid response format from Sogou")
 
                 # Parse HTML results
-                page_items = self._parse_search_page(response, query)
+                return self._parse_search_page(response, query)
 
-                if not page_items:
-                    break
+            items = await fetch_page(1)
 
-                items.extend(page_items)
+            # A full first page means there may be more; fetch the remaining
+            # pages needed for `limit` concurrently (5 pages max)
+            if page_size <= len(items) < limit:
+                last_page = min(self.MAX_SEARCH_PAGES, -(-limit // page_size))
+                for page_items in await self._gather_pages(fetch_page, range(2, last_page + 1)):
+                    if isinstance(page_items, BaseException):
+                        raise page_items
+                    if not page_items:
+                        break
 
-                # Check if we have enough items
-                if len(page_items) < page_size:
-                    break
-
-                page += 1
+                    items.extend(page_items)
 
-                # Limit to 5 pages max
-                if page > 5:
-                    break
+                    # A short page is the last one
+                    if len(page_items) < page_size:
+                        break
 
             return CrawlResult.success(
                 platform=self.platform_name,
@@ -180,13 +260,11 @@ class WeChatCrawler(BaseCrawler):
         try:
             # Find all article items (news-box elements)
             # Pattern: <div class="txt-box">...</div>
-            article_pattern = r'<div class="txt-box">(.*?)</div>\s*</li>'
-            article_matches = re.findall(article_pattern, html, re.DOTALL)
+            article_matches = list(_iter_txt_boxes(html))
 
             # Alternative pattern for different HTML structure
             if not article_matches:
-                article_pattern = r'<li[^>]*id="sogou_vr_\d+_box[^>]*"[^>]*>(.*?)</li>'
-                article_matches = re.findall(article_pattern, html, re.DOTALL)
+                article_matches = _ALT_ARTICLE_RE.findall(html)
 
             for i, match in enumerate(article_matches):
                 item = self._parse_article_item(match, i, query)
@@ -202,13 +280,13 @@ class WeChatCrawler(BaseCrawler):
         """Parse a single article item from search results."""
         try:
             # Extract title
-            title_match = re.search(r'<a[^>]*target="_blank"[^>]*>(.*?)</a>', html, re.DOTALL)
+            title_match = _TITLE_RE.search(html)
             title = ""
             url = ""
             if title_match:
                 title = self._clean_html(title_match.group(1))
                 # Extract URL
-                url_match = re.search(r'href="([^"]+)"', title_match.group(0))
+                url_match = _HREF_RE.search(title_match.group(0))
                 if url_match:
                     url = url_match.group(1)
 
@@ -216,25 +294,25 @@ class WeChatCrawler(BaseCrawler):
                 return None
 
             # Extract content/excerpt
-            content_match = re.search(r'<p class="txt-info"[^>]*>(.*?)</p>', html, re.DOTALL)
+            content_match = _TXT_INFO_RE.search(html)
             content = ""
             if content_match:
                 content = self._clean_html(content_match.group(1))
 
             # Extract account name (author)
-            account_match = re.search(r'<a[^>]*class="account"[^>]*>(.*?)</a>', html, re.DOTALL)
+            account_match = _ACCOUNT_RE.search(html)
             author_name = ""
             if account_match:
                 author_name = self._clean_html(account_match.group(1))
 
             # Alternative author extraction
             if not author_name:
-                account_match = re.search(r'<span class="s-p"[^>]*>(.*?)</span>', html)
+                account_match = _SP_RE.search(html)
                 if account_match:
                     author_name = self._clean_html(account_match.group(1))
 
             # Extract timestamp
-            time_match = re.search(r'(\d{4}[-年]\d{1,2}[-月]\d{1,2}日?)', html)
+            time_match = _DATE_RE.search(html)
             published_at = None
             if time_match:
                 date_str = time_match.group(1)
@@ -246,7 +324,7 @@ class WeChatCrawler(BaseCrawler):
                     pass
 
             # Generate unique ID based on URL or title
-            item_id = hashlib.md5(f"{url or title}".encode()).hexdigest()[:16]
+            item_id = hashlib.blake2b(f"{url or title}".encode(), digest_size=8).hexdigest()
 
             return CrawlItem(
                 id=f"wechat:{item_id}",
@@ -270,22 +348,11 @@ class WeChatCrawler(BaseCrawler):
         if not text:
             return ""
 
-        # Remove HTML tags
-        clean = re.sub(r'<[^>]+>', '', text)
-
-        # Remove em tags from highlighting
-        clean = re.sub(r'</?em>', '', clean)
-
-        # Decode HTML entities
-        clean = clean.replace("&nbsp;", " ")
-        clean = clean.replace("&lt;", "<")
-        clean = clean.replace("&gt;", ">")
-        clean = clean.replace("&amp;", "&")
-        clean = clean.replace("&quot;", '"')
-        clean = clean.replace("&#39;", "'")
+        # Remove HTML tags and decode entities
+        clean = _CLEAN_RE.sub(_clean_match, text)
 
         # Clean up whitespace
-        clean = re.sub(r'\s+', ' ', clean).strip()
+        clean = _WS_RE.sub(' ', clean).strip()
 
         return clean
 
@@ -330,7 +397,12 @@ class WeChatAccountCrawler(WeChatCrawler):
                 if self.anti_detect:
                     headers = self.anti_detect.get_headers("wechat")
 
-                response = await self._request(url, headers=headers)
+                response = await self._request(
+                    url,
+                    headers=headers,
+                    cache_ttl=self.SEARCH_CACHE_TTL_S,
+                    cache_if=_has_account_results,
+                )
 
                 if not isinstance(response, str):
                     break
@@ -364,8 +436,7 @@ class WeChatAccountCrawler(WeChatCrawler):
 
         try:
             # Find account items
-            account_pattern = r'<li[^>]*class="news-box"[^>]*>(.*?)</li>'
-            matches = re.findall(account_pattern, html, re.DOTALL)
+            matches = _ACCOUNT_ITEM_RE.findall(html)
 
             for match in matches:
                 item = self._parse_account_item(match)
@@ -381,7 +452,7 @@ class WeChatAccountCrawler(WeChatCrawler):
         """Parse a single account item."""
         try:
             # Extract account name
-            name_match = re.search(r'<p class="tit"[^>]*>(.*?)</p>', html, re.DOTALL)
+            name_match = _NAME_RE.search(html)
             name = ""
             if name_match:
                 name = self._clean_html(name_match.group(1))
@@ -390,19 +461,19 @@ class WeChatAccountCrawler(WeChatCrawler):
                 return None
 
             # Extract WeChat ID
-            wechat_id_match = re.search(r'微信号[：:]\s*([a-zA-Z0-9_-]+)', html)
+            wechat_id_match = _WECHAT_ID_RE.search(html)
             wechat_id = ""
             if wechat_id_match:
                 wechat_id = wechat_id_match.group(1)
 
             # Extract description
-            desc_match = re.search(r'<span class="sp-txt"[^>]*>(.*?)</span>', html, re.DOTALL)
+            desc_match = _DESC_RE.search(html)
             description = ""
             if desc_match:
                 description = self._clean_html(desc_match.group(1))
 
             # Generate ID
-            item_id = hashlib.md5(f"{name}:{wechat_id}".encode()).hexdigest()[:16]
+            item_id = hashlib.blake2b(f"{name}:{wechat_id}".encode(), digest_size=8).hexdigest()
 
             return CrawlItem(
                 id=f"wechat_account:{item_id}",
@@ -20,6 +20,23 @@ from app.crawlers.base import (
 )
 from app.crawlers.anti_detect import AntiDetect, ProxyPool, RateLimiter
 
+_WS_RE = re.compile(r'\s+')
+
+# Tags and common entities, stripped or decoded in a single pass
+_HTML_ENTITIES = {
+    "&nbsp;": " ",
+    "&lt;": "<",
+    "&gt;": ">",
+    "&amp;": "&",
+    "&quot;": '"',
+}
+_CLEAN_RE = re.compile(r'<[^>]+>|&(?:nbsp|lt|gt|amp|quot);')
+
+
+def _clean_match(match: "re.Match[str]") -> str:
+    """Replacement for _CLEAN_RE: decoded entity, or empty for a tag."""
+    return _HTML_ENTITIES.get(match.group(0), "")
+
 
 class ZhihuCrawler(BaseCrawler):
     """
@@ -84,16 +101,16 @@ class ZhihuCrawler(BaseCrawler):
             offset = 0
             page_size = min(limit, 20)
 
-            while len(items) < limit:
+            async def fetch_page(page_offset: int) -> Dict[str, Any]:
                 # Build search URL
                 params = {
                     "t": "general",
                     "q": query,
                     "correction": 1,
-                    "offset": offset,
+                    "offset": page_offset,
                     "limit": page_size,
                     "filter_fields": "",
-                    "lc_idx": offset,
+                    "lc_idx": page_offset,
                     "show_all_topics": 0,
                     "search_source": "Normal",
                 }
@@ -111,29 +128,44 @@ class ZhihuCrawler(BaseCrawler):
                     "x-zse-93": self._x_zse_96_key,
                 })
 
-                response = await self._request(url, headers=headers)
+                response = await self._request(
+                    url, headers=headers, cache_ttl=self.SEARCH_CACHE_TTL_S
+                )
 
                 if not isinstance(response, dict):
                     raise ParseException("Invalid response format from Zhihu search")
-
-                # Parse search results
-                data = response.get("data", [])
-                if not data:
-                    break
-
-                for item in data:
-                    parsed = self._parse_search_item(item, query)
-                    if parsed and self._is_within_time_range(parsed, time_range):
-                        items.append(parsed)
-                        if len(items) >= limit:
-                            break
-
-                # Check pagination
-                paging = response.get("paging", {})
-                if paging.get("is_end", True):
-                    break
-
-                offset += page_size
+                return response
+
+            done = False
+            while not done and len(items) < limit:
+                # Dispatch every page still needed for `limit` at once; more
+                # rounds only happen if the time filter dropped items
+                pages = -(-(limit - len(items)) // page_size)
+                offsets = [offset + i * page_size for i in range(pages)]
+                offset += pages * page_size
+
+                for response in await self._gather_pages(fetch_page, offsets):
+                    if isinstance(response, BaseException):
+                        raise response
+
+                    # Parse search results
+                    data = response.get("data", [])
+                    if not data:
+                        done = True
+                        break
+
+                    for item in data:
+                        parsed = self._parse_search_item(item, query)
+                        if parsed and self._is_within_time_range(parsed, time_range):
+                            items.append(parsed)
+                            if len(items) >= limit:
+                                break
+
+                    # Check pagination
+                    paging = response.get("paging", {})
+                    if len(items) >= limit or paging.get("is_end", True):
+                        done = True
+                        break
 
             return CrawlResult.success(
                 platform=self.platform_name,
@@ -188,7 +220,7 @@ class ZhihuCrawler(BaseCrawler):
         if self.anti_detect:
             headers = self.anti_detect.get_api_headers("zhihu")
 
-        response = await self._request(url, headers=headers)
+        response = await self._request(url, headers=headers, cache_ttl=self.DETAIL_CACHE_TTL_S)
 
         if not isinstance(response, dict):
             return None
@@ -203,7 +235,7 @@ class ZhihuCrawler(BaseCrawler):
         if self.anti_detect:
             headers = self.anti_detect.get_api_headers("zhihu")
 
-        response = await self._request(url, headers=headers)
+        response = await self._request(url, headers=headers, cache_ttl=self.DETAIL_CACHE_TTL_S)
 
         if not isinstance(response, dict):
             return None
@@ -218,7 +250,7 @@ class ZhihuCrawler(BaseCrawler):
         if self.anti_detect:
             headers = self.anti_detect.get_api_headers("zhihu")
 
-        response = await self._request(url, headers=headers)
+        response = await self._request(url, headers=headers, cache_ttl=self.DETAIL_CACHE_TTL_S)
 
         if not isinstance(response, dict):
             return None
@@ -380,16 +412,10 @@ class ZhihuCrawler(BaseCrawler):
         """Remove HTML tags from text."""
         if not text:
             return ""
-        # Remove HTML tags
-        clean = re.sub(r'<[^>]+>', '', text)
-        # Decode HTML entities
-        clean = clean.replace("&nbsp;", " ")
-        clean = clean.replace("&lt;", "<")
-        clean = clean.replace("&gt;", ">")
-        clean = clean.replace("&amp;", "&")
-        clean = clean.replace("&quot;", '"')
+        # Remove HTML tags and decode entities
+        clean = _CLEAN_RE.sub(_clean_match, text)
         # Clean up whitespace
-        clean = re.sub(r'\s+', ' ', clean).strip()
+        clean = _WS_RE.sub(' ', clean).strip()
         return clean
 
     def _is_within_time_range(self, item: CrawlItem, time_range: str) -> bool:
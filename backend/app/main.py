@@ -10,6 +10,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.v1.router import api_router
+from app.core.llm.http import close_http_client
+from app.core.tools.registry import preload_tools
+from app.crawlers.anti_detect.proxy_pool import close_proxy_pool
+from app.crawlers.http import close_crawler_session
 
 
 @asynccontextmanager
@@ -18,6 +22,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     print(f"🚀 Starting InsightSentinel Backend v{app.version}")
     print(f"📡 Environment: {settings.environment}")
+    preload_tools()
 
     # TODO: Initialize database connection pool
     # TODO: Initialize Redis connection
@@ -27,6 +32,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     print("👋 Shutting down InsightSentinel Backend")
+    await close_http_client()
+    await close_proxy_pool()
+    await close_crawler_session()
     # TODO: Close database connections
     # TODO: Close Redis connections
 